@@ -15,4 +15,6 @@ from .parents import selections
 
 from .replacements import ReplaceWorst
 
+from .evaluators import SerialEvaluator, ThreadPoolEvaluator, ProcessPoolEvaluator
+
 from .fitness import MultipleLinearRegression
\ No newline at end of file
@@ -0,0 +1,5 @@
+# flake8: noqa
+from .core import Evaluator
+from .core import SerialEvaluator
+from .core import ThreadPoolEvaluator
+from .core import ProcessPoolEvaluator
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Fitness evaluators.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, List, Optional, Sequence, Tuple
+
+import multiprocessing
+import os
+
+import numpy as np
+
+from auxein import rng
+from auxein.fitness.core import Fitness
+
+
+class Evaluator(ABC):
+    """Abstract class for evaluators.
+
+    An Evaluator is responsible for computing the fitness of a batch of genomes
+    through `Fitness.fitness_batch`, possibly spreading the work over several workers.
+    """
+
+    @abstractmethod
+    def evaluate(self, fitness_function: Fitness, genomes: np.ndarray) -> np.ndarray:
+        pass
+
+    def evaluate_genomes(self, fitness_function: Fitness, genomes: Sequence[np.ndarray]) -> np.ndarray:
+        """Computes the fitness of a sequence of (possibly uneven) genomes, issuing one
+        batch for each distinct genome dimension.
+        """
+        fitness_values = np.zeros(len(genomes))
+        dimensions = np.array([len(dna) for dna in genomes], dtype=np.int64)
+        for dimension in np.unique(dimensions):
+            indexes = np.flatnonzero(dimensions == dimension)
+            batch = np.array([genomes[int(i)] for i in indexes], dtype=float).reshape(indexes.size, dimension)
+            fitness_values[indexes] = self.evaluate(fitness_function, batch)
+        return fitness_values
+
+    def seed(self, seed_sequence: np.random.SeedSequence) -> None:
+        """Seeds the random streams of the workers, for evaluators running the fitness
+        function out of process. In-process evaluators share the caller's streams and ignore it.
+        """
+        return None
+
+    def close(self) -> None:
+        """Releases the resources (e.g. worker pools) held by the evaluator."""
+        return None
+
+    def __enter__(self) -> 'Evaluator':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class SerialEvaluator(Evaluator):
+
+    def evaluate(self, fitness_function: Fitness, genomes: np.ndarray) -> np.ndarray:
+        return np.asarray(fitness_function.fitness_batch(genomes), dtype=float)
+
+
+def _chunks(size: int, workers: int, chunk_size: Optional[int]) -> List[Tuple[int, int]]:
+    step = chunk_size if chunk_size is not None else max(1, -(-size // workers))
+    assert step > 0, 'chunk_size must be strictly positive.'
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+class ThreadPoolEvaluator(Evaluator):
+    """Evaluates chunks of genomes on a pool of threads. It only pays off when
+    `Fitness.fitness_batch` releases the GIL, e.g. for NumPy-heavy fitness functions.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: Optional[int] = None) -> None:
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self._executor: Optional[Executor] = None
+
+    def evaluate(self, fitness_function: Fitness, genomes: np.ndarray) -> np.ndarray:
+        chunks = _chunks(genomes.shape[0], self.max_workers, self.chunk_size)
+        if len(chunks) <= 1:
+            return SerialEvaluator().evaluate(fitness_function, genomes)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        results = self._executor.map(lambda chunk: fitness_function.fitness_batch(genomes[chunk[0]:chunk[1]]), chunks)
+        return np.concatenate([np.asarray(r, dtype=float) for r in results])
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+_worker_fitness: Optional[Fitness] = None
+
+
+def _init_worker(fitness_function: Fitness, seed_sequences: Optional[List[np.random.SeedSequence]], counter: Any) -> None:
+    global _worker_fitness
+    _worker_fitness = fitness_function
+    if seed_sequences is not None:
+        # every worker takes its own child stream, both for auxein and for the legacy numpy state.
+        with counter.get_lock():
+            seed_sequence = seed_sequences[counter.value % len(seed_sequences)]
+            counter.value += 1
+        rng.seed(seed_sequence)
+        np.random.seed(seed_sequence.generate_state(4))
+
+
+def _evaluate_chunk(genomes_name: str, results_name: str, shape: Tuple[int, int], start: int, stop: int) -> None:
+    assert _worker_fitness is not None, 'worker has not been initialised.'
+    genomes_shm = SharedMemory(name=genomes_name)
+    results_shm = SharedMemory(name=results_name)
+    try:
+        genomes: np.ndarray = np.ndarray(shape, dtype=np.float64, buffer=genomes_shm.buf)
+        results: np.ndarray = np.ndarray((shape[0],), dtype=np.float64, buffer=results_shm.buf)
+        results[start:stop] = _worker_fitness.fitness_batch(genomes[start:stop])
+        del genomes, results
+    finally:
+        genomes_shm.close()
+        results_shm.close()
+
+
+class ProcessPoolEvaluator(Evaluator):
+    """Evaluates chunks of genomes on a pool of processes.
+    Genomes and fitness values are exchanged through shared memory, so only the chunk
+    boundaries are sent to the workers. The fitness function is shipped once per worker
+    and must therefore be picklable.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: Optional[int] = None) -> None:
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self._executor: Optional[Executor] = None
+        self._fitness_function: Optional[Fitness] = None
+        self._seed_sequence: Optional[np.random.SeedSequence] = None
+
+    def seed(self, seed_sequence: np.random.SeedSequence) -> None:
+        self.close()
+        self._seed_sequence = seed_sequence
+
+    def __get_executor(self, fitness_function: Fitness) -> Executor:
+        if self._executor is None or self._fitness_function is not fitness_function:
+            self.close()
+            seed_sequences = self._seed_sequence.spawn(self.max_workers) if self._seed_sequence is not None else None
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(fitness_function, seed_sequences, multiprocessing.Value('i', 0))
+            )
+            self._fitness_function = fitness_function
+        return self._executor
+
+    def evaluate(self, fitness_function: Fitness, genomes: np.ndarray) -> np.ndarray:
+        genomes = np.ascontiguousarray(genomes, dtype=np.float64)
+        (n, d) = genomes.shape
+        if n == 0:
+            return np.zeros(0)
+        executor = self.__get_executor(fitness_function)
+        genomes_shm = SharedMemory(create=True, size=max(genomes.nbytes, 1))
+        results_shm = SharedMemory(create=True, size=n * np.dtype(np.float64).itemsize)
+        try:
+            shared_genomes: np.ndarray = np.ndarray((n, d), dtype=np.float64, buffer=genomes_shm.buf)
+            shared_genomes[:] = genomes
+            futures = [
+                executor.submit(_evaluate_chunk, genomes_shm.name, results_shm.name, (n, d), start, stop)
+                for (start, stop) in _chunks(n, self.max_workers, self.chunk_size)
+            ]
+            wait(futures)
+            for future in futures:
+                future.result()
+            results = np.ndarray((n,), dtype=np.float64, buffer=results_shm.buf).copy()
+            del shared_genomes
+        finally:
+            genomes_shm.close()
+            genomes_shm.unlink()
+            results_shm.close()
+            results_shm.unlink()
+        return results
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._fitness_function = None
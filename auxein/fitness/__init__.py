@@ -1,5 +1,6 @@
 # flake8: noqa
 
 from .core import Fitness
+from .cache import CachedFitness, CacheInfo
 from .kernel_based import GlobalMinimum
-from .observation_based import ObservationBasedFitness, MultipleLinearRegression, SimplePolynomialRegression, MultipleLinearRegression
\ No newline at end of file
+from .observation_based import ObservationBasedFitness, MultipleLinearRegression, PolynomialRegression, SimplePolynomialRegression, MultipleLinearRegression
\ No newline at end of file
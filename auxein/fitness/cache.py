@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Fitness memoization.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import hashlib
+import threading
+
+import numpy as np
+
+from .core import Fitness
+from auxein.population import Individual
+
+CacheInfo = NamedTuple('CacheInfo', [('hits', int), ('misses', int), ('maxsize', Optional[int]), ('currsize', int)])
+
+CacheKey = Tuple[Tuple[int, ...], bytes]
+
+
+class CachedFitness(Fitness):
+    """Memoizes the values of a deterministic fitness function.
+
+    Values are stored in a LRU cache keyed by the shape and a hash of the bytes of the genome,
+    so that unchanged genomes are never evaluated twice. Use `maxsize=None` for an unbounded cache.
+    When used with a `ProcessPoolEvaluator` every worker holds its own cache.
+    """
+
+    def __init__(self, fitness_function: Fitness, maxsize: Optional[int] = 65536) -> None:
+        super().__init__()
+        assert maxsize is None or maxsize > 0, 'maxsize must be strictly positive.'
+        self.fitness_function = fitness_function
+        self.maxsize = maxsize
+        self._cache: 'OrderedDict[CacheKey, float]' = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(dna: np.ndarray) -> CacheKey:
+        dna = np.ascontiguousarray(dna, dtype=np.float64)
+        return (dna.shape, hashlib.blake2b(dna.tobytes(), digest_size=16).digest())
+
+    def __lookup(self, key: CacheKey) -> Optional[float]:
+        value = self._cache.get(key)
+        if value is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+            self._cache.move_to_end(key)
+        return value
+
+    def __store(self, key: CacheKey, value: float) -> None:
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        if self.maxsize is not None and len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def fitness(self, individual: Individual) -> float:
+        key = self.key(individual.genotype.dna)
+        with self._lock:
+            value = self.__lookup(key)
+        if value is None:
+            value = float(self.fitness_function.fitness(individual))
+            with self._lock:
+                self.__store(key, value)
+        return value
+
+    def fitness_batch(self, genomes: np.ndarray) -> np.ndarray:
+        keys = [self.key(dna) for dna in genomes]
+        values = np.zeros(len(keys))
+        missing: Dict[CacheKey, List[int]] = OrderedDict()
+        with self._lock:
+            for (i, key) in enumerate(keys):
+                if key in missing:
+                    # the same genome appears more than once in the batch.
+                    self._hits += 1
+                    missing[key].append(i)
+                    continue
+                value = self.__lookup(key)
+                if value is None:
+                    missing[key] = [i]
+                else:
+                    values[i] = value
+        if missing:
+            rows = [indexes[0] for indexes in missing.values()]
+            computed = np.asarray(self.fitness_function.fitness_batch(genomes[rows]), dtype=float)
+            with self._lock:
+                for ((key, indexes), value) in zip(missing.items(), computed):
+                    values[indexes] = value
+                    self.__store(key, float(value))
+        return values
+
+    def value(self, individual: Individual, x: np.ndarray) -> float:
+        return self.fitness_function.value(individual, x)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._cache))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            'fitness_function': self.fitness_function,
+            'maxsize': self.maxsize,
+            'cache': self._cache,
+            'hits': self._hits,
+            'misses': self._misses
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.fitness_function = state['fitness_function']
+        self.maxsize = state['maxsize']
+        self._cache = state['cache']
+        self._hits = state['hits']
+        self._misses = state['misses']
+        self._lock = threading.Lock()
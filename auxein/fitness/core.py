@@ -5,10 +5,14 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from abc import ABC, abstractmethod
+from typing import Awaitable, List, cast
+
+import asyncio
+import inspect
 
 import numpy as np
 
-from auxein.population import Individual
+from auxein.population import Individual, build_individual
 
 
 class Fitness(ABC):
@@ -17,6 +21,24 @@ class Fitness(ABC):
     def fitness(self, individual: Individual) -> float:
         pass
 
+    def fitness_batch(self, genomes: np.ndarray) -> np.ndarray:
+        """Computes the fitness of a batch of genomes, one genome per row.
+        The default implementation falls back to `fitness` for every row: subclasses
+        should override it with a vectorised version whenever possible.
+        If `fitness` is a coroutine function, the rows are evaluated concurrently on a new
+        event loop, hence not from a thread already running one.
+        """
+        if inspect.iscoroutinefunction(self.fitness):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return np.array(asyncio.run(self.__gather_fitness(genomes)), dtype=float)
+            raise RuntimeError(f'{type(self).__name__}.fitness is a coroutine function and cannot be evaluated from a running event loop')
+        return np.array([self.fitness(build_individual(dna)) for dna in genomes], dtype=float)
+
+    async def __gather_fitness(self, genomes: np.ndarray) -> List[float]:
+        return await asyncio.gather(*(cast(Awaitable[float], self.fitness(build_individual(dna))) for dna in genomes))
+
     @abstractmethod
     def value(self, individual: Individual, x: np.ndarray) -> float:
         pass
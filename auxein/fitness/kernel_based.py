@@ -14,14 +14,24 @@ from auxein.population import Individual
 
 
 class GlobalMinimum(Fitness):
+    """Fitness function to find the global minimum of a kernel function.
+    If `vectorized` is True the kernel must accept a matrix of points (one per row)
+    and return the vector of the kernel values, so batches are evaluated in a single call.
+    """
 
-    def __init__(self, kernel: Callable[[np.ndarray], float]) -> None:
+    def __init__(self, kernel: Callable[[np.ndarray], float], vectorized: bool = False) -> None:
         super().__init__()
         self.kernel = kernel
+        self.vectorized = vectorized
 
     def fitness(self, individual: Individual) -> float:
         dna = individual.genotype.dna
         return -1 * self.kernel(dna)
 
+    def fitness_batch(self, genomes: np.ndarray) -> np.ndarray:
+        if self.vectorized:
+            return -1 * np.asarray(self.kernel(genomes), dtype=float)
+        return -1 * np.fromiter((self.kernel(dna) for dna in genomes), dtype=float, count=len(genomes))
+
     def value(self, individual: Individual, x: np.ndarray) -> float:
         return self.kernel(x)
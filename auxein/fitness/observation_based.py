@@ -5,12 +5,14 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from abc import abstractmethod
+from typing import List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
 from .core import Fitness
-from .utils import linear_fit, polynomial_fit, least_squares, logit
-from auxein.population import build_individual, Individual
+from .utils import linear_fit, polynomial_fit, polynomial_features, PolynomialDesignMatrix, linear_least_squares, logit, sigmoid, log_sigmoid
+from .utils import linear_sufficient_statistics, sufficient_statistics_least_squares
+from auxein.population import Individual
 
 
 class ObservationBasedFitness(Fitness):
@@ -25,34 +27,86 @@ class ObservationBasedFitness(Fitness):
     def value(self, individual: Individual, x: np.ndarray) -> float:
         pass
 
-    def __compute_f(self, A: np.ndarray, B: np.ndarray) -> np.ndarray:
-        F = []
-        for v in np.transpose([np.tile(A, len(B)), np.repeat(B, len(A))]):
-            F.append([v[0], v[1], self.fitness(build_individual([v[0], v[1]]))])
-        return np.array(F)
-
-    def get_landscape(self, specs: np.ndarray, size: int) -> np.ndarray:
-        assert len(specs) == 2, 'Only 2-dimensional fitness landscapes are supported at the moment.'
-        A = np.linspace(specs[0][0], specs[0][1], size)
-        B = np.linspace(specs[1][0], specs[1][1], size)
-        return self.__compute_f(A, B)
+    def __compute_f(self, axes: List[np.ndarray], point: np.ndarray, free_dimensions: Sequence[int], chunk_size: Optional[int]) -> np.ndarray:
+        # grid points are enumerated with the first axis varying fastest.
+        shape = tuple(len(axis) for axis in reversed(axes))
+        total = int(np.prod(shape))
+        step = total if chunk_size is None else chunk_size
+        assert step > 0, 'chunk_size must be strictly positive.'
+        F = np.empty((total, len(axes) + 1))
+        for start in range(0, total, step):
+            stop = min(start + step, total)
+            indexes = np.unravel_index(np.arange(start, stop), shape)[::-1]
+            points = np.tile(point, (stop - start, 1))
+            for (dimension, axis, index) in zip(free_dimensions, axes, indexes):
+                points[:, dimension] = axis[index]
+            F[start:stop, :-1] = points[:, free_dimensions]
+            F[start:stop, -1] = self.fitness_batch(points)
+        return F
+
+    def get_landscape(self, specs: np.ndarray, size: int, chunk_size: Optional[int] = None) -> np.ndarray:
+        """Computes the fitness landscape over a regular N-dimensional grid.
+
+        :param np.ndarray specs: the (lower, upper) bounds of every dimension.
+        :param int size: number of grid points along every dimension.
+        :param int chunk_size: if given, the grid is evaluated in batches of at most this many points.
+        :return: a matrix with a row [x1, ..., xn, f] for each of the size^n grid points.
+        """
+        axes = [np.linspace(lower, upper, size) for (lower, upper) in specs]
+        return self.__compute_f(axes, np.zeros(len(axes)), list(range(len(axes))), chunk_size)
+
+    def get_landscape_slice(
+        self,
+        specs: np.ndarray,
+        size: int,
+        point: np.ndarray,
+        dimensions: Tuple[int, int] = (0, 1),
+        chunk_size: Optional[int] = None
+    ) -> np.ndarray:
+        """Computes a 2-dimensional slice of a higher dimensional fitness landscape, where all the
+        dimensions but the two given ones are fixed at the values of `point`.
+
+        :param np.ndarray specs: the (lower, upper) bounds of the two sliced dimensions.
+        :return: a matrix with a row [xi, xj, f] for each of the size^2 grid points.
+        """
+        assert len(specs) == 2 and len(dimensions) == 2, 'slices must be 2-dimensional.'
+        assert dimensions[0] != dimensions[1], 'sliced dimensions must be different.'
+        axes = [np.linspace(lower, upper, size) for (lower, upper) in specs]
+        return self.__compute_f(axes, np.asarray(point, dtype=float), list(dimensions), chunk_size)
 
 
 class MultipleLinearRegression(ObservationBasedFitness):
     """Multiple linear regression fitness function.
     Given a set of observations (xi, yi), the fitness function will be computed as the
     sum of the squared residuals of the linear regression model.
+
+    If `sufficient_statistics` is True, XᵀX, Xᵀy and yᵀy are computed once at construction
+    time and every evaluation costs O(d²) regardless of the number of observations.
+    This trades a little numerical precision (the sum of squares is obtained by difference)
+    for speed when the same observations are used to evaluate a large number of genomes.
     """
 
-    def __init__(self, xs: np.ndarray, y: np.ndarray) -> None:
+    def __init__(self, xs: np.ndarray, y: np.ndarray, chunk_size: Optional[int] = None, sufficient_statistics: bool = False) -> None:
         super().__init__()
         assert xs.shape == (y.shape[0], xs.shape[1]), 'length of xs must be equal to length of y'
         self.xs = xs
         self.y = y
+        self.chunk_size = chunk_size
+        self.sufficient_statistics = sufficient_statistics
+        if sufficient_statistics:
+            (self._gram, self._moment, self._yy) = linear_sufficient_statistics(xs, y)
+
+    def __least_squares(self, coeff: np.ndarray) -> Union[float, np.ndarray]:
+        if self.sufficient_statistics:
+            return sufficient_statistics_least_squares(self._gram, self._moment, self._yy, coeff)
+        return linear_least_squares(self.xs, self.y, coeff, self.chunk_size)
 
     def fitness(self, individual: Individual) -> float:
         dna = individual.genotype.dna
-        return -1 * least_squares(self.xs, self.y, dna)
+        return -1 * float(self.__least_squares(dna))
+
+    def fitness_batch(self, genomes: np.ndarray) -> np.ndarray:
+        return -1 * np.asarray(self.__least_squares(genomes))
 
     def value(self, individual: Individual, x: np.ndarray) -> float:
         """Compute the value of the linear regression model for a given x given an individual
@@ -62,17 +116,41 @@ class MultipleLinearRegression(ObservationBasedFitness):
         return linear_fit(dna, x)
 
 
-class SimplePolynomialRegression(ObservationBasedFitness):
+class PolynomialRegression(ObservationBasedFitness):
+    """Polynomial regression fitness function over one or more variables.
+    The genome holds the coefficients of the polynomial features (see `polynomial_features`) from
+    the highest degree term down to the constant one: genomes of any length are supported and the design
+    matrix is built once per dataset and shared by all of them.
+    """
 
     def __init__(self, xs: np.ndarray, y: np.ndarray) -> None:
         super().__init__()
         assert xs.shape == (y.shape[0], xs.shape[1]), 'length of xs must be equal to length of y'
         self.xs = xs
         self.y = y
+        self._design = PolynomialDesignMatrix(xs)
 
     def fitness(self, individual: Individual) -> float:
         dna = individual.genotype.dna
-        return -1 * least_squares(self.xs, self.y, dna, fit=polynomial_fit)
+        residuals = self._design.get(dna.size) @ dna - self.y
+        return -1 * float(residuals @ residuals)
+
+    def fitness_batch(self, genomes: np.ndarray) -> np.ndarray:
+        residuals = self._design.get(genomes.shape[1]) @ genomes.T - self.y[:, np.newaxis]
+        return -1 * np.einsum('ij,ij->j', residuals, residuals)
+
+    def value(self, individual: Individual, x: np.ndarray) -> float:
+        dna = individual.genotype.dna
+        features = polynomial_features(np.atleast_2d(np.asarray(x, dtype=float)), dna.size)
+        return float(features[0] @ dna)
+
+
+class SimplePolynomialRegression(PolynomialRegression):
+    """Polynomial regression fitness function over a single variable."""
+
+    def __init__(self, xs: np.ndarray, y: np.ndarray) -> None:
+        assert xs.ndim == 2 and xs.shape[1] == 1, 'Only simple polynomial fit is supported.'
+        super().__init__(xs, y)
 
     def value(self, individual: Individual, x: np.ndarray) -> float:
         dna = individual.genotype.dna
@@ -80,25 +158,39 @@ class SimplePolynomialRegression(ObservationBasedFitness):
 
 
 class MaximumLikelihood(ObservationBasedFitness):
+    """Logistic regression fitness function. The genome is made of the intercept
+    followed by one coefficient for each feature.
 
-    def __init__(self, xs: np.ndarray, y: np.ndarray) -> None:
+    By default the fitness is the sum of the predicted probabilities of the observed classes.
+    If `log_likelihood` is True the (numerically stable) log-likelihood is used instead, which does
+    not saturate for large coefficients.
+    """
+
+    def __init__(self, xs: np.ndarray, y: np.ndarray, log_likelihood: bool = False) -> None:
         super().__init__()
         assert xs.shape == (y.shape[0], xs.shape[1]), 'length of xs must be equal to length of y'
         classes = np.unique(y)
         assert len(classes) == 2 and np.array_equal(classes, np.array([0, 1])), 'y-values can only belong [0, 1] discrete interval'
         self.xs = xs
         self.y = y
+        self.log_likelihood = log_likelihood
+        # +1 for positive observations and -1 for negative ones: since 1 - sigmoid(z) = sigmoid(-z)
+        # the probability of the observed class is always sigmoid(sign * z).
+        self._signs = 2 * y - 1
+
+    def __likelihood(self, coeff: np.ndarray) -> Union[float, np.ndarray]:
+        if coeff.ndim == 1:
+            z = self._signs * (self.xs @ coeff[1:] + coeff[0])
+        else:
+            z = self._signs[:, np.newaxis] * (self.xs @ coeff[:, 1:].T + coeff[:, 0])
+        likelihood = log_sigmoid(z) if self.log_likelihood else sigmoid(z)
+        return np.sum(likelihood, axis=0)
 
     def fitness(self, individual: Individual) -> float:
-        alpha, *coeff = individual.genotype.dna
-        y_positive = np.where(self.y == 1)
-        likelihood: float = 0
-        for x in self.xs[y_positive]:
-            likelihood += logit(alpha, coeff, x)
-        y_negative = np.where(self.y == 0)
-        for x in self.xs[y_negative]:
-            likelihood += 1 - logit(alpha, coeff, x)
-        return likelihood
+        return float(self.__likelihood(individual.genotype.dna))
+
+    def fitness_batch(self, genomes: np.ndarray) -> np.ndarray:
+        return np.asarray(self.__likelihood(genomes))
 
     def value(self, individual: Individual, x: np.ndarray) -> float:
         alpha, *coeff = individual.genotype.dna
@@ -3,5 +3,13 @@
 from .utils import linear_fit
 from .utils import polynomial_fit
 from .utils import residual
+from .utils import polynomial_features
+from .utils import PolynomialDesignMatrix
 from .utils import least_squares
+from .utils import linear_residuals
+from .utils import linear_least_squares
+from .utils import linear_sufficient_statistics
+from .utils import sufficient_statistics_least_squares
 from .utils import logit
+from .utils import sigmoid
+from .utils import log_sigmoid
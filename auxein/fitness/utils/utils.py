@@ -5,12 +5,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from typing import Callable
+from typing import Callable, List, Optional, Tuple, Union
 
 import numpy as np
 
 
 def linear_fit(coeff: np.ndarray, x: np.ndarray) -> float:
+    """Reference (single observation) implementation of a linear model, see `linear_residuals`."""
     assert type(coeff) == type(x) == np.ndarray, 'coefficients and variable must be np.ndarray'
     assert coeff.size - 1 == x.size, 'coefficients must be of the size of x+1'
     value: float = np.dot(x, coeff[:coeff.size - 1]) + coeff[coeff.size - 1]
@@ -28,15 +29,153 @@ def residual(coeff: np.array, x: np.array, yi: float, fit: Callable[[np.ndarray,
 
 
 def least_squares(xs: np.ndarray, y: np.ndarray, coeff: np.ndarray, fit: Callable[[np.ndarray, np.ndarray], float] = linear_fit) -> float:
+    """Reference implementation of the sum of squared residuals computed one observation at a time.
+    It works with any `fit` function; use `linear_least_squares` for linear models.
+    """
     lsm: float = 0
     for x, yi in zip(xs, y):
         lsm = lsm + residual(coeff, x, yi, fit)
     return lsm
 
 
+def linear_residuals(xs: np.ndarray, y: np.ndarray, coeff: np.ndarray) -> np.ndarray:
+    """Computes the residuals `xs @ w + b - y` of a linear model in matrix form.
+
+    :param np.ndarray xs: observations matrix with shape (m, d).
+    :param np.ndarray y: target vector with shape (m,).
+    :param np.ndarray coeff: either a single coefficient vector [w, b] with shape (d + 1,) or
+        a matrix of coefficients with shape (n, d + 1), one model per row.
+    :return: residuals with shape (m,), or (m, n) if a matrix of coefficients is given.
+    """
+    assert coeff.shape[-1] - 1 == xs.shape[1], 'coefficients must be of the size of x+1'
+    if coeff.ndim == 1:
+        return xs @ coeff[:-1] + coeff[-1] - y
+    return xs @ coeff[:, :-1].T + coeff[:, -1] - y[:, np.newaxis]
+
+
+def linear_least_squares(xs: np.ndarray, y: np.ndarray, coeff: np.ndarray, chunk_size: Optional[int] = None) -> Union[float, np.ndarray]:
+    """Vectorised sum of the squared residuals of a linear model (see `linear_residuals`).
+    When `coeff` is a matrix, the sum is computed for each of its rows at once.
+
+    :param int chunk_size: if given, observations are processed in chunks of at most this size
+        to bound the memory used by the residuals matrix.
+    """
+    step = xs.shape[0] if chunk_size is None else chunk_size
+    assert step > 0, 'chunk_size must be strictly positive.'
+    lsm = np.zeros(coeff.shape[:-1])
+    for start in range(0, xs.shape[0], step):
+        residuals = linear_residuals(xs[start:start + step], y[start:start + step], coeff)
+        lsm += np.einsum('i...,i...->...', residuals, residuals)
+    return float(lsm) if coeff.ndim == 1 else lsm
+
+
+def linear_sufficient_statistics(xs: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Computes the sufficient statistics of a linear least squares problem.
+    Given the augmented observations matrix A = [xs, 1], it returns the triple (AᵀA, Aᵀy, yᵀy).
+    """
+    (m, d) = xs.shape
+    column_sums = np.sum(xs, axis=0)
+    gram = np.empty((d + 1, d + 1))
+    gram[:d, :d] = xs.T @ xs
+    gram[:d, d] = column_sums
+    gram[d, :d] = column_sums
+    gram[d, d] = m
+    moment = np.append(xs.T @ y, np.sum(y))
+    return (gram, moment, float(y @ y))
+
+
+def sufficient_statistics_least_squares(gram: np.ndarray, moment: np.ndarray, yy: float, coeff: np.ndarray) -> Union[float, np.ndarray]:
+    """Sum of the squared residuals of a linear model computed from its sufficient statistics
+    (see `linear_sufficient_statistics`) as wᵀ(AᵀA)w - 2wᵀ(Aᵀy) + yᵀy, in O(d²) regardless of the number of observations.
+    As `linear_least_squares`, it accepts either a single coefficient vector or a matrix of coefficients.
+    """
+    assert coeff.shape[-1] == moment.size, 'coefficients must be of the size of x+1'
+    quadratic = np.einsum('...i,ij,...j->...', coeff, gram, coeff)
+    lsm = np.maximum(quadratic - 2 * (coeff @ moment) + yy, 0.0)
+    return float(lsm) if coeff.ndim == 1 else lsm
+
+
+def _polynomial_terms(variables: int, n: int) -> List[Tuple[int, int]]:
+    """Tells, for each of the first `n` polynomial features but the constant one, the lower degree
+    feature and the variable whose product gives it.
+    Monomials of degree d are those of degree d - 1 multiplied by the variables not after their first one,
+    so every degree is built from a suffix of the previous one.
+    """
+    terms: List[Tuple[int, int]] = []
+    # first feature of the previous degree whose variables all come after variable i, for every i.
+    (starts, end) = ([0] * variables, 1)
+    while len(terms) < n - 1:
+        next_starts = []
+        for variable in range(variables):
+            next_starts.append(len(terms) + 1)
+            terms.extend((parent, variable) for parent in range(starts[variable], end))
+        (starts, end) = (next_starts, len(terms) + 1)
+    return terms[:n - 1]
+
+
+def _fill_polynomial_features(features: np.ndarray, xs: np.ndarray, start: int) -> None:
+    terms = _polynomial_terms(xs.shape[1], features.shape[1])
+    for j in range(max(start, 1), features.shape[1]):
+        (parent, variable) = terms[j - 1]
+        features[:, j] = features[:, parent] * xs[:, variable]
+
+
+def polynomial_features(xs: np.ndarray, n: int) -> np.ndarray:
+    """Builds the design matrix of the first `n` polynomial features of the observations `xs`.
+    Features are all the monomials of the variables in increasing degree,
+    [1, x1, ..., xm, x1², x1·x2, ..., x1·xm, x2², ..., xm², x1³, ...], and the returned columns are
+    sorted from the last one to the constant term, so that for a single variable the rows are dotted
+    with coefficients in the same order used by `np.polyval`.
+    """
+    assert n > 0, 'number of features must be strictly positive.'
+    features = np.empty((xs.shape[0], n))
+    features[:, 0] = 1
+    _fill_polynomial_features(features, xs, 1)
+    return features[:, ::-1]
+
+
+class PolynomialDesignMatrix:
+    """Design matrix of polynomial features (see `polynomial_features`) for a fixed set of observations.
+    Columns are computed lazily and cached, so that genomes of different lengths share them
+    and the matrix is only extended when a longer genome is seen.
+    """
+
+    def __init__(self, xs: np.ndarray) -> None:
+        self.xs = xs
+        self._features = np.ones((xs.shape[0], 1))
+
+    @property
+    def size(self) -> int:
+        return self._features.shape[1]
+
+    def __extend(self, n: int) -> None:
+        current = self.size
+        features = np.empty((self.xs.shape[0], max(n, 2 * current)))
+        features[:, :current] = self._features
+        _fill_polynomial_features(features, self.xs, current)
+        self._features = features
+
+    def get(self, n: int) -> np.ndarray:
+        """Returns a (zero-copy) view of the design matrix for genomes of length `n`."""
+        assert n > 0, 'number of features must be strictly positive.'
+        if n > self.size:
+            self.__extend(n)
+        return self._features[:, n - 1::-1]
+
+
+def sigmoid(z: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    """Numerically stable logistic function 1 / (1 + exp(-z)): exp is only ever evaluated
+    on non-positive values so that it never overflows.
+    """
+    e = np.exp(-np.abs(z))
+    return np.where(np.asarray(z) >= 0, 1 / (1 + e), e / (1 + e))
+
+
+def log_sigmoid(z: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    """Numerically stable log(sigmoid(z)) = -log(1 + exp(-z)), computed with log-sum-exp."""
+    return -np.logaddexp(0, -np.asarray(z))
+
+
 def logit(alpha: float, coeff: np.ndarray, x: np.ndarray) -> float:
-    kernel: float = 0
-    for (bi, xi) in zip(coeff, x):
-        kernel += bi * xi
-    result: float = 1 / (1 + np.exp(-(alpha + kernel)))
+    result: float = float(sigmoid(alpha + np.dot(coeff, x)))
     return result
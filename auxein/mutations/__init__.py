@@ -2,4 +2,5 @@
 from .core import Mutation
 from .core import Uniform
 from .core import FixedVariance
-from .core import SelfAdaptiveSingleStep
\ No newline at end of file
+from .core import SelfAdaptiveSingleStep
+from .core import SelfAdaptiveNStep
@@ -5,8 +5,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from abc import ABC, abstractmethod
+from typing import Optional, Tuple
 
 from auxein.population.genotype import Genotype
+from auxein.rng import get_rng
 
 import numpy as np
 
@@ -15,52 +17,95 @@ class Mutation(ABC):
     """Abstract class for mutations.
 
     Given an Individual, a Mutation is responsible for generating a new Individual with a mutated genotype.
+    `mutate_batch` mutates a batch of genotypes, represented as a dna matrix and a mask matrix with one row
+    per genotype. Since all the rows of a batch share the same dimension, dna extensions are only supported by `mutate`.
+
+    If `mutation_probability` is given, every gene is mutated independently with that probability,
+    otherwise each mutation decides which genes are mutated.
     """
 
-    def __init__(self, extend_probability: float = 0.0):
+    def __init__(self, extend_probability: float = 0.0, mutation_probability: Optional[float] = None):
         assert 0 <= extend_probability <= 1, 'extend_probability must be within [0, 1]'
+        assert mutation_probability is None or 0 <= mutation_probability <= 1, 'mutation_probability must be within [0, 1]'
         self.extend_probability = extend_probability
+        self.mutation_probability = mutation_probability
 
-    def _extend(self, genotype: Genotype, new_gene: float) -> Genotype:
-        if np.random.uniform(0, 1) <= self.extend_probability:
+    def _extend(self, genotype: Genotype, new_gene: float, rng: Optional[np.random.Generator] = None) -> Genotype:
+        rng = get_rng(rng)
+        if rng.uniform(0, 1) <= self.extend_probability:
             dna = genotype.dna
             mask = genotype.mask
-            return Genotype(np.append(dna, new_gene), np.append(mask, np.random.normal(0, 1)))
+            return Genotype.wrap(np.append(dna, new_gene), np.append(mask, rng.normal(0, 1)))
         return genotype
 
+    def _genes_to_mutate(self, shape: Tuple[int, int], rng: np.random.Generator) -> Optional[np.ndarray]:
+        """Returns a boolean matrix flagging the genes to mutate, or None if every gene should be."""
+        if self.mutation_probability is None:
+            return None
+        return rng.random(shape) < self.mutation_probability
+
+    def _mutate_as_batch(self, genotype: Genotype, new_gene: float, rng: np.random.Generator) -> Genotype:
+        (dna, mask) = self.mutate_batch(genotype.dna[np.newaxis, :], genotype.mask[np.newaxis, :], rng)
+        return self._extend(Genotype.wrap(dna[0], mask[0]), new_gene, rng)
+
     @abstractmethod
-    def mutate(self, genotype: Genotype) -> Genotype:
+    def mutate(self, genotype: Genotype, rng: Optional[np.random.Generator] = None) -> Genotype:
         pass
 
+    def mutate_batch(self, dna: np.ndarray, mask: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Mutates a batch of genotypes, returning the new dna and mask matrices.
+        Input matrices are never modified. The default implementation falls back to `mutate`
+        for every row, dropping any dna extension.
+        """
+        genotypes = [self.mutate(Genotype(d, m)) if rng is None else self.mutate(Genotype(d, m), rng) for (d, m) in zip(dna, mask)]
+        return (
+            np.array([g.dna[:dna.shape[1]] for g in genotypes]).reshape(dna.shape),
+            np.array([g.mask[:mask.shape[1]] for g in genotypes]).reshape(mask.shape)
+        )
+
 
 class Uniform(Mutation):
+    """Uniform mutation: a random gene of every genotype (or each gene with probability
+    `mutation_probability`) is replaced by a value drawn uniformly within the bounds.
+    """
 
-    def __init__(self, lower_bound: float, upper_bound: float, extend_probability: float = 0.0) -> None:
-        super().__init__(extend_probability=extend_probability)
+    def __init__(self, lower_bound: float, upper_bound: float, extend_probability: float = 0.0, mutation_probability: Optional[float] = None) -> None:
+        super().__init__(extend_probability=extend_probability, mutation_probability=mutation_probability)
         self.lower_bound = lower_bound
         self.upper_bound = upper_bound
 
-    def mutate(self, genotype: Genotype) -> Genotype:
-        gene_index = np.random.randint(
-            0,
-            genotype.dimension
-        )
-        dna = genotype.dna
-        dna[gene_index] = np.random.uniform(self.lower_bound, self.upper_bound)
-        new_gene = np.random.uniform(self.lower_bound, self.upper_bound)
-        return super()._extend(Genotype(dna, genotype.mask), new_gene)
+    def mutate(self, genotype: Genotype, rng: Optional[np.random.Generator] = None) -> Genotype:
+        rng = get_rng(rng)
+        return self._mutate_as_batch(genotype, rng.uniform(self.lower_bound, self.upper_bound), rng)
+
+    def mutate_batch(self, dna: np.ndarray, mask: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        rng = get_rng(rng)
+        (n, d) = dna.shape
+        genes = self._genes_to_mutate((n, d), rng)
+        if genes is None:
+            mutated = np.array(dna, dtype=float)
+            mutated[np.arange(n), rng.integers(0, d, n)] = rng.uniform(self.lower_bound, self.upper_bound, n)
+            return (mutated, mask.copy())
+        return (np.where(genes, rng.uniform(self.lower_bound, self.upper_bound, (n, d)), dna), mask.copy())
 
 
 class FixedVariance(Mutation):
 
-    def __init__(self, sigma: float, extend_probability: float = 0.0) -> None:
-        super().__init__(extend_probability=extend_probability)
+    def __init__(self, sigma: float, extend_probability: float = 0.0, mutation_probability: Optional[float] = None) -> None:
+        super().__init__(extend_probability=extend_probability, mutation_probability=mutation_probability)
         self.sigma = sigma
 
-    def mutate(self, genotype: Genotype) -> Genotype:
-        move = np.vectorize(lambda g: g + np.random.normal(0, self.sigma))
-        new_gene = np.random.normal(0, self.sigma)
-        return super()._extend(Genotype(move(genotype.dna), genotype.mask), new_gene)
+    def mutate(self, genotype: Genotype, rng: Optional[np.random.Generator] = None) -> Genotype:
+        rng = get_rng(rng)
+        return self._mutate_as_batch(genotype, rng.normal(0, self.sigma), rng)
+
+    def mutate_batch(self, dna: np.ndarray, mask: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        rng = get_rng(rng)
+        moves = rng.normal(0, self.sigma, dna.shape)
+        genes = self._genes_to_mutate(dna.shape, rng)
+        if genes is not None:
+            moves *= genes
+        return (dna + moves, mask.copy())
 
 
 class SelfAdaptiveSingleStep(Mutation):
@@ -70,15 +115,59 @@ class SelfAdaptiveSingleStep(Mutation):
     "Evolutionary Computation 2:dvanced Algorithms and Operators. Institute of Physics Publishing", Bristol, 2000.
     """
 
-    def __init__(self, tau: float, extend_probability: float = 0.0) -> None:
-        super().__init__(extend_probability=extend_probability)
+    def __init__(self, tau: float, extend_probability: float = 0.0, mutation_probability: Optional[float] = None) -> None:
+        super().__init__(extend_probability=extend_probability, mutation_probability=mutation_probability)
         self.tau = tau
 
-    def mutate(self, genotype: Genotype) -> Genotype:
-        multiplier = np.exp(np.random.normal(0, self.tau))
-        move_mask = np.vectorize(lambda g: g * multiplier)
-        updated_mask = move_mask(genotype.mask)
-        scalr = np.random.normal(0, 1, genotype.dimension)
-        dna = genotype.dna + (updated_mask * scalr)
-        new_gene = np.random.normal(0, self.tau)
-        return super()._extend(Genotype(dna, updated_mask), new_gene)
+    def mutate(self, genotype: Genotype, rng: Optional[np.random.Generator] = None) -> Genotype:
+        rng = get_rng(rng)
+        return self._mutate_as_batch(genotype, rng.normal(0, self.tau), rng)
+
+    def mutate_batch(self, dna: np.ndarray, mask: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        rng = get_rng(rng)
+        multipliers = np.exp(rng.normal(0, self.tau, (dna.shape[0], 1)))
+        updated_mask = mask * multipliers
+        moves = updated_mask * rng.normal(0, 1, dna.shape)
+        genes = self._genes_to_mutate(dna.shape, rng)
+        if genes is not None:
+            moves *= genes
+        return (dna + moves, updated_mask)
+
+
+class SelfAdaptiveNStep(Mutation):
+    """Self-adaptive n-step mutation as described in [back01]: every gene has its own step size,
+    which is stored in the mask and mutated as σ'i = σi·exp(τ'·N(0, 1) + τ·Ni(0, 1)).
+    If not given, τ' and τ default to 1/sqrt(2n) and 1/sqrt(2·sqrt(n)), n being the dna dimension.
+    Step sizes are taken in absolute value, as masks are usually drawn from N(0, 1), and bounded
+    from below by `epsilon`.
+    """
+
+    def __init__(
+        self,
+        tau: Optional[float] = None,
+        tau_prime: Optional[float] = None,
+        epsilon: float = 0.0,
+        extend_probability: float = 0.0,
+        mutation_probability: Optional[float] = None
+    ) -> None:
+        super().__init__(extend_probability=extend_probability, mutation_probability=mutation_probability)
+        self.tau = tau
+        self.tau_prime = tau_prime
+        self.epsilon = epsilon
+
+    def mutate(self, genotype: Genotype, rng: Optional[np.random.Generator] = None) -> Genotype:
+        rng = get_rng(rng)
+        return self._mutate_as_batch(genotype, rng.normal(0, 1), rng)
+
+    def mutate_batch(self, dna: np.ndarray, mask: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        rng = get_rng(rng)
+        (n, d) = dna.shape
+        tau = self.tau if self.tau is not None else 1 / np.sqrt(2 * np.sqrt(d))
+        tau_prime = self.tau_prime if self.tau_prime is not None else 1 / np.sqrt(2 * d)
+        exponents = tau_prime * rng.normal(0, 1, (n, 1)) + tau * rng.normal(0, 1, (n, d))
+        updated_mask = np.maximum(np.abs(mask) * np.exp(exponents), self.epsilon)
+        moves = updated_mask * rng.normal(0, 1, (n, d))
+        genes = self._genes_to_mutate((n, d), rng)
+        if genes is not None:
+            moves *= genes
+        return (dna + moves, updated_mask)
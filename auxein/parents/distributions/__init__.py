@@ -3,3 +3,6 @@ from .core import Distribution
 from .core import Fps
 from .core import FpsWithWindowing
 from .core import SigmaScaling
+from .core import LinearRanking
+from .core import ExponentialRanking
+from .core import Boltzmann
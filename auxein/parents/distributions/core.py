@@ -5,25 +5,55 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from abc import ABC, abstractmethod
-from typing import Tuple, List
+from typing import Tuple
 
-from auxein.population import Item, Population
+import numpy as np
+
+from auxein.population import Population
+
+
+def _normalise(weights: np.ndarray) -> np.ndarray:
+    total = np.sum(weights)
+    if weights.size == 0 or not total > 0:
+        return np.full(weights.size, 1 / max(weights.size, 1))
+    return weights / total
+
+
+def _ranks(fitness: np.ndarray) -> np.ndarray:
+    """Returns the rank of every fitness value, from 0 (worst) to len(fitness) - 1 (best)."""
+    ranks = np.empty(fitness.size, dtype=np.int64)
+    ranks[np.argsort(fitness, kind='stable')] = np.arange(fitness.size)
+    return ranks
 
 
 class Distribution(ABC):
+    """Abstract class for parents distributions.
+
+    Given a population, a Distribution computes the probability of every individual to be selected
+    as a parent. It returns the array of the individual ids and the array of their probabilities,
+    both in population order.
+    """
+
+    def get(self, population: Population) -> Tuple[np.ndarray, np.ndarray]:
+        return (population.ids(), self.probabilities(population.fitness_values()))
 
     @abstractmethod
-    def get(self, population: Population) -> List[Tuple[str, float]]:
+    def probabilities(self, fitness: np.ndarray) -> np.ndarray:
         pass
 
 
 class Fps(Distribution):
+    """Fitness proportional selection. Negative fitness values are shifted so that
+    the minimum one is zero.
+    """
 
     def __init__(self) -> None:
         super().__init__()
 
-    def get(self, population: Population) -> List[Tuple[str, float]]:
-        return list(map(lambda item: (item.individual.id, item.fitness / population.total_fitness()), population.pool))
+    def probabilities(self, fitness: np.ndarray) -> np.ndarray:
+        if fitness.size > 0 and np.min(fitness) < 0:
+            fitness = fitness - np.min(fitness)
+        return _normalise(fitness)
 
 
 class FpsWithWindowing(Distribution):
@@ -31,13 +61,10 @@ class FpsWithWindowing(Distribution):
     def __init__(self) -> None:
         super().__init__()
 
-    def __scale_fitness_function(self, item: Item, minimum_fitness: float) -> float:
-        return item.fitness - minimum_fitness
-
-    def get(self, population: Population) -> List[Tuple[str, float]]:
-        minimum_fitness = population.min_fitness()
-        total_fitness = sum(self.__scale_fitness_function(item, minimum_fitness) for item in population.pool)
-        return list(map(lambda item: (item.individual.id, self.__scale_fitness_function(item, minimum_fitness) / total_fitness), population.pool))
+    def probabilities(self, fitness: np.ndarray) -> np.ndarray:
+        if fitness.size == 0:
+            return fitness
+        return _normalise(fitness - np.min(fitness))
 
 
 class SigmaScaling(Distribution):
@@ -45,10 +72,54 @@ class SigmaScaling(Distribution):
     def __init__(self) -> None:
         super().__init__()
 
-    def __scale_fitness_function(self, item: Item, population: Population) -> float:
-        max_value: float = max(item.fitness - (population.mean_fitness() - 2 * population.std_fitness()), 0)
-        return max_value
+    def probabilities(self, fitness: np.ndarray) -> np.ndarray:
+        if fitness.size == 0:
+            return fitness
+        return _normalise(np.maximum(fitness - (np.mean(fitness) - 2 * np.std(fitness)), 0))
+
+
+class LinearRanking(Distribution):
+    """Linear ranking selection, where `s` in (1, 2] is the expected number of offspring
+    allotted to the fittest individual.
+    """
+
+    def __init__(self, s: float = 1.5) -> None:
+        super().__init__()
+        assert 1 < s <= 2, 's must be within (1, 2]'
+        self.s = s
+
+    def probabilities(self, fitness: np.ndarray) -> np.ndarray:
+        mu = fitness.size
+        if mu <= 1:
+            return np.ones(mu)
+        ranks = _ranks(fitness)
+        return (2 - self.s) / mu + 2 * ranks * (self.s - 1) / (mu * (mu - 1))
+
+
+class ExponentialRanking(Distribution):
+    """Exponential ranking selection: the weight of an individual is c^k, where k is
+    the number of individuals fitter than it and c is in (0, 1).
+    """
+
+    def __init__(self, c: float = 0.9) -> None:
+        super().__init__()
+        assert 0 < c < 1, 'c must be within (0, 1)'
+        self.c = c
+
+    def probabilities(self, fitness: np.ndarray) -> np.ndarray:
+        ranks = _ranks(fitness)
+        return _normalise(self.c ** (fitness.size - 1 - ranks))
+
+
+class Boltzmann(Distribution):
+    """Boltzmann selection: the probability of an individual is proportional to exp(f / temperature)."""
+
+    def __init__(self, temperature: float = 1.0) -> None:
+        super().__init__()
+        assert temperature > 0, 'temperature must be strictly positive'
+        self.temperature = temperature
 
-    def get(self, population: Population) -> List[Tuple[str, float]]:
-        total_fitness = sum(self.__scale_fitness_function(item, population) for item in population.pool)
-        return list(map(lambda item: (item[0].id, self.__scale_fitness_function(item, population) / total_fitness), population.pool))
+    def probabilities(self, fitness: np.ndarray) -> np.ndarray:
+        if fitness.size == 0:
+            return fitness
+        return _normalise(np.exp((fitness - np.max(fitness)) / self.temperature))
@@ -1,4 +1,9 @@
 # flake8: noqa
 from .core import Selection
 from .core import cumulative_probability_distribution
-from .core import StochasticUniversalSampling
\ No newline at end of file
+from .core import StochasticUniversalSampling
+from .core import TournamentSelection
+from .core import TruncationSelection
+from .core import AliasTable
+from .core import RouletteWheelSelection
+from .core import sample_couples
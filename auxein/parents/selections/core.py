@@ -5,44 +5,161 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional, Tuple
 
 import numpy as np
 
+from auxein.population import Population
+from auxein.parents.distributions import Distribution
+from auxein.rng import get_rng
+
 
 def cumulative_probability_distribution(index: int, probabilities: List[float]) -> float:
     return sum(probabilities[:index + 1])
 
 
 class Selection(ABC):
+    """Abstract class for parents selections.
+
+    A Selection picks `parents_to_select` parents, enough to generate `offspring_size` children
+    by mating every ordered couple, and returns their indexes in population order.
+    """
 
     def __init__(self, offspring_size: int) -> None:
         self.__offspring_size = offspring_size
-        self.parents_to_select = np.around(np.roots([1, -1, -offspring_size / 2])[0])
+        self.parents_to_select = int(np.around(np.roots([1, -1, -offspring_size / 2])[0]))
 
     @property
     def offspring_size(self) -> int:
         return self.__offspring_size
 
     @abstractmethod
-    def select(self, individual_ids: List[str], probabilities: List[float]) -> List[str]:
+    def select(self, probabilities: np.ndarray, rng: Optional[np.random.Generator] = None) -> np.ndarray:
         pass
 
+    def select_from_population(self, population: Population, distribution: Distribution, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        (_, probabilities) = distribution.get(population)
+        return self.select(probabilities, rng)
+
 
 class StochasticUniversalSampling(Selection):
 
     def __init__(self, offspring_size: int) -> None:
         super().__init__(offspring_size=offspring_size)
 
-    def select(self, individual_ids: List[str], probabilities: List[float]) -> List[str]:
-        index = 0
-        mating_pool: List[str] = []
-        r = np.random.uniform(0, 1 / self.parents_to_select)
-        while len(mating_pool) < self.parents_to_select:
-            while r <= cumulative_probability_distribution(index, probabilities):
-                mating_pool.append(individual_ids[index])
-                r += 1 / self.parents_to_select
+    def select(self, probabilities: np.ndarray, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        cumulative = np.cumsum(probabilities)
+        step = 1 / self.parents_to_select
+        pointers = get_rng(rng).uniform(0, step) + step * np.arange(self.parents_to_select)
+        indexes = np.searchsorted(cumulative, pointers, side='left')
+        # guards against cumulative probabilities summing to slightly less than 1.
+        return np.minimum(indexes, len(cumulative) - 1)
+
+
+class TournamentSelection(Selection):
+    """Tournament selection: every parent is the fittest of `tournament_size` individuals
+    drawn uniformly at random (with replacement).
+    The fitness array is used directly and no Distribution is needed; when used through
+    `select`, any array which is monotone in the fitness (such as probabilities) works.
+    """
+
+    def __init__(self, offspring_size: int, tournament_size: int = 2) -> None:
+        super().__init__(offspring_size=offspring_size)
+        assert tournament_size > 0, 'tournament_size must be strictly positive'
+        self.tournament_size = tournament_size
+
+    def select(self, probabilities: np.ndarray, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        values = np.asarray(probabilities)
+        contestants = get_rng(rng).integers(0, values.size, (self.parents_to_select, self.tournament_size))
+        winners = np.argmax(values[contestants], axis=1)
+        return contestants[np.arange(self.parents_to_select), winners]
+
+    def select_from_population(self, population: Population, distribution: Distribution, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        return self.select(population.fitness_values(), rng)
+
+
+class TruncationSelection(Selection):
+    """Truncation selection: the `parents_to_select` fittest individuals are selected.
+    As `TournamentSelection`, it works directly on the fitness array.
+    """
+
+    def __init__(self, offspring_size: int) -> None:
+        super().__init__(offspring_size=offspring_size)
+
+    def select(self, probabilities: np.ndarray, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        values = np.asarray(probabilities)
+        k = min(self.parents_to_select, values.size)
+        if k == values.size:
+            return np.arange(values.size)
+        return np.argpartition(-values, k - 1)[:k]
+
+    def select_from_population(self, population: Population, distribution: Distribution, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        return self.select(population.fitness_values(), rng)
+
+
+class AliasTable:
+    """Walker's alias table, built with Vose's algorithm.
+
+    Building the table costs O(n), after which every draw from the discrete
+    distribution given by `probabilities` costs O(1).
+    """
+
+    def __init__(self, probabilities: np.ndarray) -> None:
+        probabilities = np.asarray(probabilities, dtype=float)
+        n = probabilities.size
+        assert n > 0, 'probabilities must not be empty'
+        total = np.sum(probabilities)
+        assert total > 0, 'probabilities must sum to a positive value'
+        scaled = probabilities * (n / total)
+        self.n = n
+        self.probabilities = np.ones(n)
+        self.aliases = np.arange(n)
+        small: List[int] = np.flatnonzero(scaled < 1).tolist()
+        large: List[int] = np.flatnonzero(scaled >= 1).tolist()
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            self.probabilities[s] = scaled[s]
+            self.aliases[s] = g
+            scaled[g] = (scaled[g] + scaled[s]) - 1
+            (small if scaled[g] < 1 else large).append(g)
+        # leftovers are only due to floating point rounding and keep probability one.
+
+    def draw(self, size: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Draws `size` independent indexes, with replacement."""
+        rng = get_rng(rng)
+        columns = rng.integers(0, self.n, size)
+        return np.where(rng.random(size) < self.probabilities[columns], columns, self.aliases[columns])
+
+
+class RouletteWheelSelection(Selection):
+    """Roulette wheel selection: parents are drawn independently and with replacement
+    from the distribution. Draws are made through an `AliasTable`, so that large mating
+    pools cost O(n + k) rather than O(n k).
+    """
+
+    def __init__(self, offspring_size: int) -> None:
+        super().__init__(offspring_size=offspring_size)
+
+    def select(self, probabilities: np.ndarray, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        return AliasTable(probabilities).draw(self.parents_to_select, rng)
+
 
-            index += 1
+def sample_couples(pool_size: int, couples: int, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Samples `couples` distinct unordered pairs of distinct parents out of a mating pool of
+    `pool_size` parents, so that (a, b) and (b, a) are never both drawn.
+    Pairs are drawn as indexes into the k(k-1)/2 pairs of the pool and decoded by inverting
+    the triangular numbers, hence without building the whole list of pairs.
 
-        return mating_pool
+    :return: two arrays with the first and the second parent of each couple, first < second.
+    """
+    total = pool_size * (pool_size - 1) // 2
+    assert 0 <= couples <= total, f'at most {total} couples can be drawn out of {pool_size} parents'
+    m = get_rng(rng).choice(total, couples, replace=False).astype(np.int64)
+    # pair (i, j), with i < j, has index j(j - 1)/2 + i.
+    second = ((1 + np.sqrt(1 + 8 * m.astype(float))) // 2).astype(np.int64)
+    # rounding fix-ups for very large indexes.
+    second -= (second * (second - 1) // 2) > m
+    second += ((second + 1) * second // 2) <= m
+    first = m - second * (second - 1) // 2
+    return (first, second)
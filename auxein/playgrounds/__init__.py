@@ -1,2 +1,4 @@
 # flake8: noqa
 from .static import Static
+from .islands import Islands
+from .steady_state import SteadyState
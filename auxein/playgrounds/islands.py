@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""Islands playground.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from multiprocessing.connection import Connection
+from typing import Dict, Any, List, Tuple, Callable, Optional, Union
+
+import logging
+import multiprocessing
+import traceback
+
+import numpy as np
+
+from auxein.fitness import Fitness
+from auxein.population import Population, Individual
+from auxein.playgrounds.static import Playground, Static
+
+Migrants = List[Tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+
+class _Island:
+    """Wraps the playground of an island and exposes the operations the `Islands`
+    playground drives it with. Populations only cross islands as raw arrays.
+    """
+
+    def __init__(self, playground: Static) -> None:
+        self.playground = playground
+
+    def run(self, generations: int) -> Dict[str, Any]:
+        population = self.playground.population
+        stats = self.playground.train(population.generation_count + generations)
+        # genomes are left on the island, only the fitness history travels back.
+        return {
+            'generation_count': population.generation_count,
+            'generations': {g: {'mean_fitness': s['mean_fitness']} for (g, s) in stats['generations'].items()}
+        }
+
+    def emigrate(self, k: int) -> Migrants:
+        population = self.playground.population
+        return population.export([individual_id for (individual_id, _) in population.rank_by_fitness(k)])
+
+    def immigrate(self, migrants: Migrants) -> None:
+        population = self.playground.population
+        arrivals = sum(fitness.size for (_, _, fitness) in migrants)
+        population.kill_batch([individual_id for (individual_id, _) in population.rank_by_fitness(arrivals, reverse=False)])
+        for (dna, mask, fitness) in migrants:
+            population.add_batch(dna, mask, fitness)
+
+    def collect(self) -> Migrants:
+        population = self.playground.population
+        return population.export(population.ids())
+
+    def close(self) -> None:
+        # evaluators may own worker processes, which must be stopped for the island to exit.
+        self.playground.evaluator.close()
+
+
+def _island_worker(
+    index: int,
+    playground_factory: Callable[[int, np.random.SeedSequence], Static],
+    seed_sequence: np.random.SeedSequence,
+    connection: Connection
+) -> None:
+    island: Optional[_Island] = None
+    try:
+        island = _Island(playground_factory(index, seed_sequence))
+        connection.send((True, None))
+        while True:
+            (method, args) = connection.recv()
+            if method is None:
+                break
+            connection.send((True, getattr(island, method)(*args)))
+    except Exception:
+        connection.send((False, traceback.format_exc()))
+    finally:
+        if island is not None:
+            island.close()
+        connection.close()
+
+
+class Islands(Playground):
+    """Island model: `islands` independent populations evolve side by side and, every
+    `migration_interval` generations, each island sends copies of its `migrants` best
+    individuals to another island, where they replace the worst ones.
+
+    Islands are built by `playground_factory(island_index, seed_sequence)`, which must return a
+    `Static` playground and, when islands run in separate processes, must be picklable
+    (e.g. a module level function). Islands exchange migrants as raw dna, mask and fitness
+    arrays, so fitness values are reused as they are and the fitness function should be the
+    same, stationary one on every island.
+
+    :param Fitness fitness: fitness function of the islands, used by `predict`.
+    :param topology: 'ring' sends migrants from island i to island i + 1, 'random' to a random
+        other island at every migration.
+    :param bool processes: if True every island runs in its own process, otherwise islands run
+        one after the other in the current process.
+    """
+
+    def __init__(
+        self,
+        fitness: Fitness,
+        playground_factory: Callable[[int, np.random.SeedSequence], Static],
+        islands: int,
+        migration_interval: int,
+        migrants: int = 1,
+        topology: str = 'ring',
+        processes: bool = True,
+        seed: Optional[Union[int, np.random.SeedSequence]] = None
+    ) -> None:
+        assert islands > 0, 'islands must be strictly positive'
+        assert migration_interval > 0, 'migration_interval must be strictly positive'
+        assert migrants >= 0, 'migrants must be non negative'
+        assert topology in ('ring', 'random'), 'topology must be either ring or random'
+        super().__init__(population=Population(), fitness=fitness)
+        self.playground_factory = playground_factory
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.topology = topology
+        self.processes = processes
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence.spawn(1)[0])
+        self.populations: List[Population] = []
+
+    def __destinations(self) -> np.ndarray:
+        if self.topology == 'ring' or self.islands < 2:
+            return (np.arange(self.islands) + 1) % self.islands
+        # a random other island for each island.
+        shifts = self.rng.integers(1, self.islands, self.islands)
+        return (np.arange(self.islands) + shifts) % self.islands
+
+    def __call_all(self, connections: List[Connection], method: str, args: List[Tuple[Any, ...]]) -> List[Any]:
+        for (connection, arguments) in zip(connections, args):
+            connection.send((method, arguments))
+        return [self.__receive(connection) for connection in connections]
+
+    def __receive(self, connection: Connection) -> Any:
+        (ok, result) = connection.recv()
+        if not ok:
+            raise RuntimeError(f'island failed with:\n{result}')
+        return result
+
+    def __call_local(self, islands: List[_Island], method: str, args: List[Tuple[Any, ...]]) -> List[Any]:
+        return [getattr(island, method)(*arguments) for (island, arguments) in zip(islands, args)]
+
+    def train(self, max_generations: int) -> Dict[str, Any]:
+        logging.info(f'Starting evolution of {self.islands} islands with a maximum of {max_generations} generations')
+        seed_sequences = self.seed_sequence.spawn(self.islands)
+        if not self.processes:
+            islands = [_Island(self.playground_factory(i, seed_sequences[i])) for i in range(self.islands)]
+            try:
+                return self.__train(max_generations, lambda method, args: self.__call_local(islands, method, args))
+            finally:
+                for island in islands:
+                    island.close()
+
+        context = multiprocessing.get_context()
+        pipes = [context.Pipe() for _ in range(self.islands)]
+        workers = [
+            context.Process(target=_island_worker, args=(i, self.playground_factory, seed_sequences[i], pipes[i][1]))
+            for i in range(self.islands)
+        ]
+        connections = [parent for (parent, _) in pipes]
+        try:
+            for worker in workers:
+                worker.start()
+            for (_, child) in pipes:
+                child.close()
+            for connection in connections:
+                self.__receive(connection)
+            return self.__train(max_generations, lambda method, args: self.__call_all(connections, method, args))
+        finally:
+            for connection in connections:
+                try:
+                    connection.send((None, ()))
+                except OSError:
+                    pass
+                connection.close()
+            for worker in workers:
+                worker.join()
+
+    def __train(self, max_generations: int, call: Callable[[str, List[Tuple[Any, ...]]], List[Any]]) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            'islands': [{'generations': {}} for _ in range(self.islands)],
+            'migrations': 0
+        }
+        generation = 0
+        while generation < max_generations:
+            epoch = min(self.migration_interval, max_generations - generation)
+            results = call('run', [(epoch,)] * self.islands)
+            for (island_stats, result) in zip(stats['islands'], results):
+                island_stats['generations'].update(result['generations'])
+            generation += epoch
+            # islands that can no longer evolve (e.g. too small) stop the whole run.
+            if any(result['generation_count'] < generation for result in results):
+                break
+            if generation < max_generations and self.migrants > 0 and self.islands > 1:
+                emigrants = call('emigrate', [(self.migrants,)] * self.islands)
+                arrivals: List[Migrants] = [[] for _ in range(self.islands)]
+                for (source, destination) in enumerate(self.__destinations()):
+                    arrivals[destination].extend(emigrants[source])
+                call('immigrate', [(migrants,) for migrants in arrivals])
+                stats['migrations'] += 1
+                logging.debug(f'Migration {stats["migrations"]} at generation {generation}')
+
+        self.populations = []
+        self.population = Population()
+        for groups in call('collect', [()] * self.islands):
+            population = Population()
+            for (dna, mask, fitness) in groups:
+                population.add_batch(dna, mask, fitness)
+                self.population.add_batch(dna, mask, fitness)
+            self.populations.append(population)
+        logging.info(f'Training ended with average_fitness: {self.population.mean_fitness()} over {self.islands} islands')
+        return stats
+
+    def predict(self, x: np.ndarray, depth: int = 0) -> float:
+        i = super()._get_nth_top_performant(depth)
+        return self.fitness.value(i, x)
+
+    def get_most_performant(self, depth: int = 0) -> Individual:
+        return super()._get_nth_top_performant(depth)
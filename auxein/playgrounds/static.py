@@ -5,20 +5,20 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Tuple, Callable
+from typing import Dict, Any, List, Tuple, Callable, Optional, Union
 
 import logging
-from itertools import permutations
 
 import numpy as np
 
+from auxein.evaluators import Evaluator, SerialEvaluator
 from auxein.fitness import Fitness
 from auxein.population.individual import build_individual, Individual
-from auxein.population import Population
+from auxein.population import Population, Genotype
 from auxein.mutations import Mutation
 from auxein.recombinations import Recombination
 from auxein.parents.distributions import Distribution
-from auxein.parents.selections import Selection
+from auxein.parents.selections import Selection, sample_couples
 from auxein.replacements import Replacement
 
 logging.basicConfig(level=logging.DEBUG)
@@ -59,7 +59,13 @@ class Static(Playground):
         recombination: Recombination,
         replacement: Replacement,
         verbose: bool = False,
-        pruning_function: Callable[[Individual], bool] = lambda i: False
+        pruning_function: Optional[Callable[[Individual], bool]] = None,
+        evaluator: Optional[Evaluator] = None,
+        stationary_fitness: bool = False,
+        pipeline: bool = False,
+        pruning_batch_function: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None,
+        lazy_offspring: bool = False,
+        seed: Optional[Union[int, np.random.SeedSequence]] = None
     ) -> None:
         super().__init__(population=population, fitness=fitness)
         self.mutation = mutation
@@ -69,14 +75,71 @@ class Static(Playground):
         self.replacement = replacement
         self.verbose = verbose
         self.pruning_function = pruning_function
-
-    def __mate(self, mating_pool: List[str]) -> List[Individual]:
-        couples = permutations(mating_pool, 2)
+        self.evaluator = evaluator if evaluator is not None else SerialEvaluator()
+        # survivors of a stationary fitness function keep their fitness, so only
+        # new or changed individuals need to be evaluated at every generation.
+        self.stationary_fitness = stationary_fitness
+        # in pipeline mode a whole generation runs on dna and mask matrices and
+        # `Individual` objects are only built when a per-individual pruning function needs them.
+        self.pipeline = pipeline
+        self.pruning_batch_function = pruning_batch_function
+        # in lazy offspring mode only as many couples as the replacement needs children are
+        # bred, and a couple is never bred twice in both orders.
+        self.lazy_offspring = lazy_offspring
+        # every random draw comes from streams spawned by the playground's own seed sequence:
+        # one for the operators and one split across the evaluator's workers.
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        (operators_seed, evaluator_seed) = self.seed_sequence.spawn(2)
+        self.rng = np.random.default_rng(operators_seed)
+        self.evaluator.seed(evaluator_seed)
+
+    def __supports_batch_mating(self) -> bool:
+        return self.mutation.extend_probability <= 0 and not self.recombination.allow_uneven
+
+    def __couples(self, pool_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        if not self.lazy_offspring:
+            # ordered couples of distinct parents, in the same order as `itertools.permutations`.
+            (first, second) = np.nonzero(~np.eye(pool_size, dtype=bool))
+        else:
+            available_couples = pool_size * (pool_size - 1) // 2
+            demand = self.replacement.offspring_demand(self.population, 2 * available_couples)
+            (first, second) = sample_couples(pool_size, min(-(-demand // 2), available_couples), self.rng)
+        # replacements needing more children than the mating pool yields, as (μ, λ) with λ >= μ,
+        # get extra couples drawn again from the available ones.
+        missing = -(-self.replacement.offspring_demand(self.population, 2 * first.size) // 2) - first.size
+        if missing > 0 and first.size > 0:
+            extra = self.rng.choice(first.size, missing)
+            (first, second) = (np.concatenate((first, first[extra])), np.concatenate((second, second[extra])))
+        return (first, second)
+
+    def __mate_batch(self, dna: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        (first, second) = self.__couples(dna.shape[0])
+        # every parent is mutated independently for each couple it belongs to.
+        (parents1_dna, parents1_mask) = self.mutation.mutate_batch(dna[first], mask[first], self.rng)
+        (parents2_dna, parents2_mask) = self.mutation.mutate_batch(dna[second], mask[second], self.rng)
+        (children1_dna, children2_dna) = self.recombination.recombine_batch(parents1_dna, parents2_dna, self.rng)
+        # children of the same couple are kept next to each other.
+        children_dna = np.stack((children1_dna, children2_dna), axis=1).reshape(2 * first.size, dna.shape[1])
+        children_mask = np.stack((parents1_mask, parents2_mask), axis=1).reshape(2 * first.size, mask.shape[1])
+        return (children_dna, children_mask)
+
+    def __mate(self, mating_pool: List[int]) -> List[Individual]:
+        genotypes = [self.population.get(parent_id).individual.genotype for parent_id in mating_pool]
+        dimensions = set((g.dimension, g.mask.size) for g in genotypes)
+        if len(dimensions) != 1 or not self.__supports_batch_mating():
+            return self.__mate_uneven(genotypes, np.stack(self.__couples(len(mating_pool)), axis=1))
+
+        dna = np.array([g.dna for g in genotypes])
+        mask = np.array([g.mask for g in genotypes]).reshape(len(genotypes), -1)
+        (children_dna, children_mask) = self.__mate_batch(dna, mask)
+        return [build_individual(children_dna[c], children_mask[c]) for c in range(children_dna.shape[0])]
+
+    def __mate_uneven(self, genotypes: List[Genotype], couples: np.ndarray) -> List[Individual]:
         offspring = []
-        for (parent1_id, parent2_id) in couples:
+        for (parent1, parent2) in couples:
             (child1_genotype_dna, child1_genotype_mask, child2_genotype_dna, child2_genotype_mask) = self.__breed(
-                parent1_id,
-                parent2_id
+                self.mutation.mutate(genotypes[parent1], self.rng),
+                self.mutation.mutate(genotypes[parent2], self.rng)
             )
 
             offspring.append(build_individual(child1_genotype_dna, child1_genotype_mask))
@@ -84,18 +147,54 @@ class Static(Playground):
 
         return offspring
 
-    def __breed(self, parent1_id: str, parent2_id: str) -> Tuple[List[float], List[float], List[float], List[float]]:
-        parent_1 = self.population.get(parent1_id).individual.mutate(self.mutation)
-        parent_2 = self.population.get(parent2_id).individual.mutate(self.mutation)
-
-        parent1_genotype_dna = parent_1.genotype.dna
-        parent2_genotype_dna = parent_2.genotype.dna
-
+    def __breed(self, parent_1: Genotype, parent_2: Genotype) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         (child1_genotype_dna, child2_genotype_dna) = self.recombination.recombine(
-            parent1_genotype_dna,
-            parent2_genotype_dna
+            parent_1.dna,
+            parent_2.dna,
+            self.rng
         )
-        return (child1_genotype_dna, parent_1.genotype.mask, child2_genotype_dna, parent_2.genotype.mask)
+        return (child1_genotype_dna, parent_1.mask, child2_genotype_dna, parent_2.mask)
+
+    def __run_generation(self) -> None:
+        parents = self.selection.select_from_population(self.population, self.distribution, self.rng)
+        mating_pool: List[int] = self.population.ids()[parents].tolist()
+        offspring = self.__mate(mating_pool)
+
+        # Pruning step
+        if self.pruning_function is not None:
+            offspring = [i for i in offspring if not self.pruning_function(i)]
+        if self.pruning_batch_function is not None:
+            # offspring of mixed dimensions are handed over one row at a time.
+            offspring = [
+                i for i in offspring
+                if not self.pruning_batch_function(i.genotype.dna.reshape(1, -1), i.genotype.mask.reshape(1, -1))[0]
+            ]
+
+        # Replacement step
+        self.replacement.replace(offspring, self.population, self.fitness, self.evaluator, self.rng)
+
+    def __run_pipeline_generation(self) -> None:
+        dna = self.population.dna_matrix()
+        mask = self.population.mask_matrix()
+
+        parents = self.selection.select_from_population(self.population, self.distribution, self.rng)
+        (children_dna, children_mask) = self.__mate_batch(dna[parents], mask[parents])
+
+        # Pruning step
+        keep = np.ones(children_dna.shape[0], dtype=bool)
+        if self.pruning_batch_function is not None:
+            keep &= ~np.asarray(self.pruning_batch_function(children_dna, children_mask), dtype=bool)
+        if self.pruning_function is not None:
+            keep &= ~np.array([
+                self.pruning_function(build_individual(children_dna[c], children_mask[c]))
+                for c in range(children_dna.shape[0])
+            ], dtype=bool)
+
+        # Replacement step
+        self.replacement.replace_batch(children_dna[keep], children_mask[keep], self.population, self.fitness, self.evaluator, self.rng)
+
+    def __can_run_pipeline(self) -> bool:
+        return self.pipeline and self.__supports_batch_mating() and self.population.has_uniform_dimensions()
 
     def train(self, max_generations: int) -> Dict[str, Any]:
         logging.info(f'Starting evolution cycle with a maximum of {max_generations} generations')
@@ -113,20 +212,11 @@ class Static(Playground):
             stats['generations'][self.population.generation_count]['mean_fitness'] = mean_fitness
             stats['generations'][self.population.generation_count]['genome'] = self.population.get_full_genome()
 
-            # Mating step
-            distribution = self.distribution.get(self.population)
-            individual_ids = list(map(lambda i : i[0], distribution))
-            probabilities = list(map(lambda i : i[1], distribution))
-
-            mating_pool: List[str] = self.selection.select(individual_ids, probabilities)
-            offspring = self.__mate(mating_pool)
-
-            # Pruning step
-            offspring = list(filter(lambda i: not self.pruning_function(i), offspring))
-
-            # Replacement step
-            self.replacement.replace(offspring, self.population, self.fitness)
-            self.population.update(self.fitness)
+            if self.__can_run_pipeline():
+                self.__run_pipeline_generation()
+            else:
+                self.__run_generation()
+            self.population.update(self.fitness, self.evaluator, incremental=self.stationary_fitness)
 
         logging.info(f'Training ended with average_fitness: {self.population.mean_fitness()} and a population size of {self.population.size()}')
         return stats
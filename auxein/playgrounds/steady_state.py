@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""Steady state playground.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
+
+import asyncio
+import inspect
+import logging
+
+import numpy as np
+
+from auxein.fitness import Fitness
+from auxein.population.individual import build_individual, Individual
+from auxein.population import Population
+from auxein.mutations import Mutation
+from auxein.recombinations import Recombination
+from auxein.parents.distributions import Distribution
+from auxein.parents.selections import Selection, sample_couples
+from auxein.replacements import Replacement, CommaReplacement
+from auxein.playgrounds.static import Playground
+
+
+class SteadyState(Playground):
+    """Asynchronous steady state playground.
+
+    Instead of breeding and evaluating whole generations, it keeps `workers` evaluations in
+    flight: as soon as one completes, the child joins the population through
+    `Replacement.replace_evaluated` and a new child, bred from the current population, is sent
+    to evaluation. Slow evaluations therefore never hold back the others. As children join one
+    at a time, (μ, λ) replacement, which needs μ children at once, is not supported.
+
+    `Fitness.fitness` may be either a coroutine function, which is awaited, or a blocking one,
+    which runs on `executor` (a pool of `workers` threads by default; a process pool requires
+    a picklable fitness function). Individuals of the population without a fitness are evaluated
+    the same way, `workers` at a time, before the evolution starts.
+    A generation is counted every `population.size()` completed evaluations.
+    """
+
+    def __init__(
+        self,
+        population: Population,
+        fitness: Fitness,
+        mutation: Mutation,
+        distribution: Distribution,
+        selection: Selection,
+        recombination: Recombination,
+        replacement: Replacement,
+        workers: int = 1,
+        executor: Optional[Executor] = None,
+        verbose: bool = False,
+        seed: Optional[Union[int, np.random.SeedSequence]] = None
+    ) -> None:
+        assert workers > 0, 'workers must be strictly positive'
+        assert not isinstance(replacement, CommaReplacement), '(μ, λ) replacement needs whole generations of children, which SteadyState does not breed'
+        super().__init__(population=population, fitness=fitness)
+        self.mutation = mutation
+        self.distribution = distribution
+        self.selection = selection
+        self.recombination = recombination
+        self.replacement = replacement
+        self.workers = workers
+        self.executor = executor
+        self.verbose = verbose
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence.spawn(1)[0])
+        self.__nursery: List[Individual] = []
+
+    def __breed(self) -> Individual:
+        # children come in pairs: the second one of a couple waits for the next free worker.
+        if not self.__nursery:
+            parents = self.selection.select_from_population(self.population, self.distribution, self.rng)
+            if np.unique(parents).size < 2:
+                parents = self.rng.choice(self.population.size(), 2, replace=False)
+            ((first,), (second,)) = sample_couples(parents.size, 1, self.rng)
+            ids = self.population.ids()
+            parent1 = self.population.get(int(ids[parents[first]])).individual.genotype
+            parent2 = self.population.get(int(ids[parents[second]])).individual.genotype
+            mutated1 = self.mutation.mutate(parent1, self.rng)
+            mutated2 = self.mutation.mutate(parent2, self.rng)
+            (child1_dna, child2_dna) = self.recombination.recombine(mutated1.dna, mutated2.dna, self.rng)
+            self.__nursery = [build_individual(child1_dna, mutated1.mask), build_individual(child2_dna, mutated2.mask)]
+        return self.__nursery.pop()
+
+    async def __evaluate(self, individual: Individual, executor: Executor) -> Tuple[Individual, float]:
+        if inspect.iscoroutinefunction(self.fitness.fitness):
+            fitness = await self.fitness.fitness(individual)
+        else:
+            fitness = await asyncio.get_running_loop().run_in_executor(executor, self.fitness.fitness, individual)
+        return (individual, float(fitness))
+
+    async def __evaluate_dirty(self, executor: Executor) -> None:
+        if self.population.dirty_count() == 0:
+            return
+        slots = asyncio.Semaphore(self.workers)
+
+        async def evaluate(individual: Individual) -> Tuple[Individual, float]:
+            async with slots:
+                return await self.__evaluate(individual, executor)
+
+        dirty = [self.population.get(i).individual for i in self.population.ids().tolist() if self.population.is_dirty(i)]
+        for (individual, fitness) in await asyncio.gather(*(evaluate(individual) for individual in dirty)):
+            self.population.add(individual, fitness)
+
+    def __insert(self, individual: Individual, fitness: float) -> None:
+        genotype = individual.genotype
+        self.replacement.replace_evaluated(
+            genotype.dna[np.newaxis, :],
+            genotype.mask.reshape(1, -1),
+            np.array([fitness]),
+            self.population,
+            self.rng
+        )
+
+    async def evolve(self, max_generations: int) -> Dict[str, Any]:
+        """Coroutine running the evolution, for callers that already run an event loop."""
+        logging.info(f'Starting steady state evolution with a maximum of {max_generations} generations and {self.workers} workers')
+        stats: Dict[str, Any] = {
+            'generations': {},
+            'evaluations': 0
+        }
+        executor = self.executor if self.executor is not None else ThreadPoolExecutor(max_workers=self.workers)
+        in_flight: Set['asyncio.Task[Tuple[Individual, float]]'] = set()
+        completed = 0
+        try:
+            await self.__evaluate_dirty(executor)
+            while self.population.generation_count < max_generations and self.population.size() > 1:
+                while len(in_flight) < self.workers:
+                    in_flight.add(asyncio.ensure_future(self.__evaluate(self.__breed(), executor)))
+                (done, in_flight) = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    (individual, fitness) = task.result()
+                    self.__insert(individual, fitness)
+                    completed += 1
+                    stats['evaluations'] += 1
+                if completed >= self.population.size():
+                    completed = 0
+                    mean_fitness = self.population.mean_fitness()
+                    stats['generations'][self.population.generation_count] = {'mean_fitness': mean_fitness}
+                    if self.verbose is True:
+                        logging.debug(f'Completed generation: {self.population.generation_count}/{max_generations} -- average_fitness: {mean_fitness}')
+                    # nothing is left dirty, so this only moves the population to the next generation.
+                    await self.__evaluate_dirty(executor)
+                    self.population.update(self.fitness, incremental=True)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.wait(in_flight)
+            if self.executor is None:
+                executor.shutdown()
+
+        logging.info(f'Training ended with average_fitness: {self.population.mean_fitness()} after {stats["evaluations"]} evaluations')
+        return stats
+
+    def train(self, max_generations: int) -> Dict[str, Any]:
+        return asyncio.run(self.evolve(max_generations))
+
+    def predict(self, x: np.ndarray, depth: int = 0) -> float:
+        i = super()._get_nth_top_performant(depth)
+        return self.fitness.value(i, x)
+
+    def get_most_performant(self, depth: int = 0) -> Individual:
+        return super()._get_nth_top_performant(depth)
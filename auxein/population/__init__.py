@@ -4,6 +4,6 @@ from .genotype import Genotype
 from .dna_builders import UniformRandomDnaBuilder, NormalRandomDnaBuilder, CompositeDnaBuilder
 
 from .individual import Individual
-from .individual import build_individual
+from .individual import build_individual, as_id
 
 from .core import build_fixed_dimension_population, build_variable_dimension_population, Item, Population
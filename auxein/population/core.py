@@ -1,108 +1,331 @@
 """Contains the population class.
 """
 from __future__ import absolute_import
-from copy import deepcopy
-from typing import Tuple, NamedTuple, Iterable, Dict, Any, Optional, List
+from typing import Tuple, NamedTuple, Iterable, Dict, Any, Optional, List, Union
 
 import numpy as np
 
 from auxein.population.dna_builders import DnaBuilder
-from auxein.population.individual import Individual, build_individual
+from auxein.population.genotype import Genotype
+from auxein.population.individual import Individual, build_individual, new_ids, as_id
+from auxein.population.statistics import RunningStatistics, SortedIndex
 from auxein.fitness.core import Fitness
+from auxein.evaluators import Evaluator, SerialEvaluator
+from auxein.rng import get_rng
 
 Item = NamedTuple('Item', [('individual', Individual), ('fitness', float)])
 
 
 class Population:
+    """Population of individuals backed by a struct-of-arrays storage.
 
-    def __init__(self) -> None:
-        self.__pool: Dict[str, Item] = {}
+    All genomes live in a single 2-D array (one row per slot, padded to the
+    largest dimension seen so far) and fitness values, ids and birth generations are
+    kept in parallel 1-D arrays. Slots released by `kill` are reused by later
+    `add` calls and the storage grows geometrically when full.
+    `Item` and `Individual` objects are only built on demand as views over a slot.
+    """
+
+    def __init__(self, initial_capacity: int = 16) -> None:
+        assert initial_capacity > 0, 'initial_capacity must be strictly positive.'
+        self.__dna = np.zeros((initial_capacity, 0))
+        self.__mask = np.zeros((initial_capacity, 0))
+        self.__dimensions = np.zeros(initial_capacity, dtype=np.int64)
+        self.__mask_dimensions = np.zeros(initial_capacity, dtype=np.int64)
+        self.__fitness = np.zeros(initial_capacity)
+        self.__birth_generation = np.zeros(initial_capacity, dtype=np.int64)
+        self.__ids = np.empty(initial_capacity, dtype=object)
+        self.__alive = np.zeros(initial_capacity, dtype=bool)
+        self.__dirty = np.zeros(initial_capacity, dtype=bool)
+        self.__slots: Dict[int, int] = {}
+        self.__free_slots: List[int] = []
+        self.__high_water = 0
+        self.__live_cache: Optional[np.ndarray] = None
         self.__generation_count = 0
+        # evaluated individuals are also indexed by fitness, keyed by slot, so that ranking
+        # queries and extremes do not need to sort the population.
+        self.__fitness_index = SortedIndex()
+        self.__fitness_stats = RunningStatistics(lambda: self.__fitness_index.values)
+        self.__birth_generation_stats = RunningStatistics(lambda: self.__birth_generation[self.__live_slots()])
 
     def size(self) -> int:
-        return len(self.__pool)
-
-    def add(self, individual: Individual, fitness: float) -> None:
-        self.__pool[str(individual.id)] = Item(deepcopy(individual), fitness)
-
-    def get(self, individual_id: str) -> Item:
-        return deepcopy(self.__pool[individual_id])
+        return len(self.__slots)
 
-    def update(self, fitness_function: Fitness) -> None:
-        for item in self.__pool.values():
-            individual = item.individual
-            new_fitness = fitness_function.fitness(individual)
-            self.__pool[str(individual.id)] = Item(
-                deepcopy(individual), new_fitness)
+    @property
+    def capacity(self) -> int:
+        return self.__fitness.shape[0]
+
+    def __grow(self, capacity: int, width: int) -> None:
+        (current_capacity, current_width) = self.__dna.shape
+        if capacity > current_capacity:
+            extra = capacity - current_capacity
+            self.__dimensions = np.concatenate((self.__dimensions, np.zeros(extra, dtype=np.int64)))
+            self.__mask_dimensions = np.concatenate((self.__mask_dimensions, np.zeros(extra, dtype=np.int64)))
+            self.__fitness = np.concatenate((self.__fitness, np.zeros(extra)))
+            self.__birth_generation = np.concatenate((self.__birth_generation, np.zeros(extra, dtype=np.int64)))
+            self.__ids = np.concatenate((self.__ids, np.empty(extra, dtype=object)))
+            self.__alive = np.concatenate((self.__alive, np.zeros(extra, dtype=bool)))
+            self.__dirty = np.concatenate((self.__dirty, np.zeros(extra, dtype=bool)))
+        capacity = max(capacity, current_capacity)
+        width = max(width, current_width)
+        if (capacity, width) != (current_capacity, current_width):
+            self.__dna = self.__resize_matrix(self.__dna, capacity, width)
+            self.__mask = self.__resize_matrix(self.__mask, capacity, width)
+
+    @staticmethod
+    def __resize_matrix(matrix: np.ndarray, rows: int, columns: int) -> np.ndarray:
+        resized = np.zeros((rows, columns))
+        resized[:matrix.shape[0], :matrix.shape[1]] = matrix
+        return resized
+
+    def __allocate_slot(self) -> int:
+        if self.__free_slots:
+            return self.__free_slots.pop()
+        if self.__high_water == self.capacity:
+            self.__grow(2 * self.capacity, self.__dna.shape[1])
+        slot = self.__high_water
+        self.__high_water += 1
+        return slot
+
+    def __allocate_slots(self, n: int) -> np.ndarray:
+        reused = min(n, len(self.__free_slots))
+        slots = [self.__free_slots.pop() for _ in range(reused)]
+        fresh = n - reused
+        if self.__high_water + fresh > self.capacity:
+            self.__grow(max(2 * self.capacity, self.__high_water + fresh), self.__dna.shape[1])
+        slots.extend(range(self.__high_water, self.__high_water + fresh))
+        self.__high_water += fresh
+        return np.array(slots, dtype=np.int64)
+
+    def __live_slots(self) -> np.ndarray:
+        if self.__live_cache is None:
+            self.__live_cache = np.flatnonzero(self.__alive[:self.__high_water])
+        return self.__live_cache
+
+    def __individual(self, slot: int) -> Individual:
+        # storage rows are overwritten when slots are reused, so genotypes get their own copy.
+        genotype = Genotype.wrap(
+            self.__dna[slot, :self.__dimensions[slot]].copy(),
+            self.__mask[slot, :self.__mask_dimensions[slot]].copy()
+        )
+        return Individual(genotype, self.__ids[slot], int(self.__birth_generation[slot]))
+
+    def __item(self, slot: int) -> Item:
+        return Item(self.__individual(slot), float(self.__fitness[slot]))
+
+    def add(self, individual: Individual, fitness: Optional[float] = None) -> None:
+        """Adds an individual to the population. If its fitness is not given, the individual
+        is flagged as dirty and its fitness is NaN until the next `update`.
+        """
+        individual_id = individual.id
+        slot = self.__slots.get(individual_id)
+        if slot is None:
+            slot = self.__allocate_slot()
+        else:
+            self.__release_stats(slot)
+        genotype = individual.genotype
+        dna = genotype.dna
+        mask = genotype.mask
+        if max(dna.size, mask.size) > self.__dna.shape[1]:
+            self.__grow(self.capacity, max(dna.size, mask.size))
+        self.__dna[slot, :dna.size] = dna
+        self.__mask[slot, :mask.size] = mask
+        self.__dimensions[slot] = dna.size
+        self.__mask_dimensions[slot] = mask.size
+        # a NaN fitness, as exported by unevaluated individuals, is the same as no fitness.
+        if fitness is not None and np.isnan(fitness):
+            fitness = None
+        self.__fitness[slot] = np.nan if fitness is None else fitness
+        self.__dirty[slot] = fitness is None
+        birth_generation = self.__generation_count if individual.birth_generation is None else individual.birth_generation
+        self.__birth_generation[slot] = birth_generation
+        self.__ids[slot] = individual_id
+        self.__alive[slot] = True
+        self.__slots[individual_id] = slot
+        self.__live_cache = None
+        if fitness is not None:
+            self.__fitness_stats.push(fitness)
+            self.__fitness_index.insert(fitness, slot)
+        self.__birth_generation_stats.push(birth_generation)
+
+    def add_batch(self, dna: np.ndarray, mask: np.ndarray, fitness: Optional[np.ndarray] = None) -> np.ndarray:
+        """Adds a batch of new individuals, given as a dna matrix and a mask matrix with one row
+        per individual, writing them into the storage with bulk assignments.
+        As for `add`, individuals added without fitness are flagged as dirty.
+
+        :return: the ids of the new individuals.
+        """
+        n = dna.shape[0]
+        assert mask.shape[0] == n, 'dna and mask must have the same number of rows'
+        assert fitness is None or fitness.shape == (n,), 'one fitness value per individual is required'
+        slots = self.__allocate_slots(n)
+        if max(dna.shape[1], mask.shape[1]) > self.__dna.shape[1]:
+            self.__grow(self.capacity, max(dna.shape[1], mask.shape[1]))
+        ids = np.empty(n, dtype=object)
+        ids[:] = new_ids(n).tolist()
+        self.__dna[slots, :dna.shape[1]] = dna
+        self.__mask[slots, :mask.shape[1]] = mask
+        self.__dimensions[slots] = dna.shape[1]
+        self.__mask_dimensions[slots] = mask.shape[1]
+        self.__fitness[slots] = np.nan if fitness is None else fitness
+        # rows with a NaN fitness, as exported by unevaluated individuals, are dirty as well.
+        self.__dirty[slots] = np.isnan(self.__fitness[slots])
+        self.__birth_generation[slots] = self.__generation_count
+        self.__ids[slots] = ids
+        self.__alive[slots] = True
+        self.__slots.update(zip(ids, slots.tolist()))
+        self.__live_cache = None
+        if fitness is not None:
+            fitness = np.asarray(fitness, dtype=float)
+            self.__fitness_stats.push_many(fitness[~np.isnan(fitness)])
+            self.__index_fitness(slots)
+        self.__birth_generation_stats.push_many(np.full(n, float(self.__generation_count)))
+        return ids
+
+    def __index_fitness(self, slots: np.ndarray) -> None:
+        fitness = self.__fitness[slots]
+        evaluated = ~np.isnan(fitness)
+        self.__fitness_index.insert_many(fitness[evaluated], slots[evaluated])
+
+    def __release_stats(self, slot: int) -> None:
+        if not np.isnan(self.__fitness[slot]):
+            self.__fitness_stats.remove(self.__fitness[slot])
+            self.__fitness_index.remove(self.__fitness[slot], slot)
+        self.__birth_generation_stats.remove(float(self.__birth_generation[slot]))
+
+    def get(self, individual_id: Union[int, str]) -> Item:
+        return self.__item(self.__slots[as_id(individual_id)])
+
+    def mark_dirty(self, individual_id: Union[int, str]) -> None:
+        """Flags an individual whose fitness must be recomputed at the next incremental `update`."""
+        self.__dirty[self.__slots[as_id(individual_id)]] = True
+
+    def is_dirty(self, individual_id: Union[int, str]) -> bool:
+        return bool(self.__dirty[self.__slots[as_id(individual_id)]])
+
+    def dirty_count(self) -> int:
+        return int(np.count_nonzero(self.__dirty[self.__live_slots()]))
+
+    def update(self, fitness_function: Fitness, evaluator: Optional[Evaluator] = None, incremental: bool = False) -> None:
+        """Recomputes the fitness of the population and moves it to the next generation.
+
+        :param Fitness fitness_function: fitness function to evaluate the individuals.
+        :param Evaluator evaluator: Evaluator used to compute the fitness (serial by default).
+        :param bool incremental: if True only the individuals added without a fitness or flagged
+            with `mark_dirty` are evaluated, otherwise the whole population is. Incremental updates
+            are only correct for stationary fitness functions.
+        """
+        evaluator = evaluator if evaluator is not None else SerialEvaluator()
+        live = self.__live_slots()
+        if incremental:
+            live = live[self.__dirty[live]]
+            previous_fitness = self.__fitness[live]
+            self.__fitness_stats.remove_many(previous_fitness[~np.isnan(previous_fitness)])
+            self.__fitness_index.remove_many(live)
+        dimensions = self.__dimensions[live]
+        for dimension in np.unique(dimensions):
+            slots = live[dimensions == dimension]
+            self.__fitness[slots] = evaluator.evaluate(fitness_function, self.__dna[slots, :dimension])
+        self.__dirty[live] = False
+        if incremental:
+            self.__fitness_stats.push_many(self.__fitness[live])
+            self.__index_fitness(live)
+        else:
+            self.__fitness_stats.reset(self.__fitness[live])
+            self.__fitness_index.reset(np.zeros(0), np.zeros(0, dtype=np.int64))
+            self.__index_fitness(live)
         self.__generation_count += 1
 
-    def kill(self, individual_id: str) -> None:
-        try:
-            del self.__pool[individual_id]
-        except KeyError:
-            pass
+    def kill(self, individual_id: Union[int, str]) -> None:
+        slot = self.__slots.pop(as_id(individual_id), None)
+        if slot is None:
+            return
+        self.__release_stats(slot)
+        self.__alive[slot] = False
+        self.__dirty[slot] = False
+        self.__ids[slot] = None
+        self.__free_slots.append(slot)
+        self.__live_cache = None
+
+    def kill_batch(self, individual_ids: Iterable[Union[int, str]]) -> None:
+        """Kills a batch of individuals; unknown ids are ignored as in `kill`."""
+        popped = [self.__slots.pop(as_id(individual_id), None) for individual_id in individual_ids]
+        slots = np.array([slot for slot in popped if slot is not None], dtype=np.int64)
+        if slots.size == 0:
+            return
+        fitness = self.__fitness[slots]
+        self.__fitness_stats.remove_many(fitness[~np.isnan(fitness)])
+        self.__fitness_index.remove_many(slots)
+        self.__birth_generation_stats.remove_many(self.__birth_generation[slots].astype(float))
+        self.__alive[slots] = False
+        self.__dirty[slots] = False
+        self.__ids[slots] = None
+        self.__free_slots.extend(slots.tolist())
+        self.__live_cache = None
+
+    def ids(self) -> np.ndarray:
+        """Returns the ids of the individuals, in the same order used by `pool` and `fitness_values`."""
+        return self.__ids[self.__live_slots()]
+
+    def fitness_values(self) -> np.ndarray:
+        """Returns the fitness of the individuals, in the same order used by `pool` and `ids`."""
+        return self.__fitness[self.__live_slots()]
+
+    def birth_generations(self) -> np.ndarray:
+        """Returns the birth generation of the individuals, in the same order used by `pool` and `ids`."""
+        return self.__birth_generation[self.__live_slots()]
 
     @property
     def pool(self) -> Iterable[Item]:
-        return self.__pool.values()
+        return [self.__item(slot) for slot in self.__live_slots()]
 
     def total_fitness(self) -> float:
-        total_fitness: float = 0.0
-        for item in self.__pool.values():
-            total_fitness += item.fitness
-        return total_fitness
+        return self.__fitness_stats.total
 
     @property
     def generation_count(self) -> int:
         return self.__generation_count
 
-    def rank_by_fitness(self, k: Optional[int] = None, reverse: bool = True) -> List[Tuple[str, float]]:
-        sorted_values = sorted(self.pool, key=lambda i: i.fitness, reverse=reverse)
-        return list(map(lambda item : (item.individual.id, item.fitness), sorted_values))[:k]
-
-    def __get_ages(self) -> List[float]:
-        return list(map(lambda item : item.individual.age(), list(self.__pool.values())))
-
-    def __get_fitness(self) -> List[float]:
-        return list(map(lambda item : item.fitness, list(self.__pool.values())))
+    def rank_by_fitness(self, k: Optional[int] = None, reverse: bool = True) -> List[Tuple[int, float]]:
+        """Returns the ids and fitness of the k best (or, if not `reverse`, worst) individuals.
+        Rankings are read from the fitness index in O(k); individuals that have not been
+        evaluated yet come last.
+        """
+        (fitness, slots) = self.__fitness_index.largest(k) if reverse else self.__fitness_index.smallest(k)
+        if k is None or slots.size < k:
+            live = self.__live_slots()
+            unevaluated = live[np.isnan(self.__fitness[live])][:None if k is None else k - slots.size]
+            fitness = np.concatenate((fitness, self.__fitness[unevaluated]))
+            slots = np.concatenate((slots, unevaluated))
+        return list(zip(self.__ids[slots].tolist(), fitness.tolist()))
+
+    # Individuals' ages are measured in generations and derived from the running statistics
+    # of their birth generations, since age = generation_count - birth_generation.
 
     def mean_age(self) -> float:
-        pools_ages = self.__get_ages()
-        value: float = np.mean(pools_ages)
-        return value
+        return self.__generation_count - self.__birth_generation_stats.mean
 
     def std_age(self) -> float:
-        pools_ages = self.__get_ages()
-        value: float = np.std(pools_ages)
-        return value
+        return self.__birth_generation_stats.std
 
     def max_age(self) -> float:
-        pools_ages = self.__get_ages()
-        value: float = np.max(pools_ages)
-        return value
+        return self.__generation_count - self.__birth_generation_stats.min
 
     def min_age(self) -> float:
-        pools_ages = self.__get_ages()
-        value: float = np.min(pools_ages)
-        return value
+        return self.__generation_count - self.__birth_generation_stats.max
 
     def mean_fitness(self) -> float:
-        return self.total_fitness() / self.size()
+        """Mean fitness of the (evaluated) individuals of the population, in O(1)."""
+        return self.__fitness_stats.mean
 
     def max_fitness(self) -> float:
-        pools_fitness_values = self.__get_fitness()
-        value: float = np.max(pools_fitness_values)
-        return value
+        return self.__fitness_index.max
 
     def min_fitness(self) -> float:
-        pools_fitness_values = self.__get_fitness()
-        value: float = np.min(pools_fitness_values)
-        return value
+        return self.__fitness_index.min
 
     def std_fitness(self) -> float:
-        pools_fitness_values = self.__get_fitness()
-        value: float = np.std(pools_fitness_values)
-        return value
+        return self.__fitness_stats.std
 
     def get_stats(self) -> Dict[str, Any]:
         return {
@@ -118,30 +341,91 @@ class Population:
             'std_fitness': self.std_fitness()
         }
 
-    def get_full_genome(self) -> np.ndarray:
-        genome = []
-        for item in self.pool:
-            genome.append(item.individual.genotype.dna)
-        return np.array(genome)
-
+    def __uniform_width(self, dimensions: np.ndarray) -> Optional[int]:
+        if dimensions.size == 0:
+            return 0
+        return int(dimensions[0]) if np.all(dimensions == dimensions[0]) else None
+
+    def has_uniform_dimensions(self) -> bool:
+        """Tells whether all the individuals share the same dna and mask dimensions."""
+        live = self.__live_slots()
+        return self.__uniform_width(self.__dimensions[live]) is not None and self.__uniform_width(self.__mask_dimensions[live]) is not None
+
+    def export(self, individual_ids: Iterable[Union[int, str]]) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Exports individuals as raw arrays, e.g. to move them to another population with `add_batch`.
+        Individuals are grouped by dna and mask dimensions and every group is returned as a
+        (dna matrix, mask matrix, fitness array) triple.
+        """
+        slots = np.array([self.__slots[as_id(individual_id)] for individual_id in individual_ids], dtype=np.int64)
+        shapes = np.stack((self.__dimensions[slots], self.__mask_dimensions[slots]), axis=1).reshape(-1, 2)
+        groups = []
+        for (dimension, mask_dimension) in np.unique(shapes, axis=0):
+            group = slots[(shapes[:, 0] == dimension) & (shapes[:, 1] == mask_dimension)]
+            groups.append((self.__dna[group, :dimension], self.__mask[group, :mask_dimension], self.__fitness[group]))
+        return groups
+
+    def dna_matrix(self) -> np.ndarray:
+        """Returns a copy of the dna of the population, one row per individual in population order.
+        All the individuals must have the same dimension.
+        """
+        live = self.__live_slots()
+        width = self.__uniform_width(self.__dimensions[live])
+        assert width is not None, 'individuals must have the same dimension'
+        return self.__dna[live, :width]
+
+    def mask_matrix(self) -> np.ndarray:
+        """Returns a copy of the masks of the population, one row per individual in population order.
+        All the masks must have the same dimension.
+        """
+        live = self.__live_slots()
+        width = self.__uniform_width(self.__mask_dimensions[live])
+        assert width is not None, 'masks must have the same dimension'
+        return self.__mask[live, :width]
 
-def build_random_individual(dimension: int, dna_builder: DnaBuilder) -> Individual:
-    mask = np.repeat(np.random.normal(0, 1), dimension)
-    dna = dna_builder.get(dimension)
+    def get_full_genome(self) -> np.ndarray:
+        """Returns the genome of the whole population as a matrix with one row per individual.
+        If individuals have different dimensions an array of (ragged) dna vectors is returned instead.
+        """
+        live = self.__live_slots()
+        dimensions = self.__dimensions[live]
+        if self.__uniform_width(dimensions) is not None:
+            return self.dna_matrix()
+        genome = np.empty(live.size, dtype=object)
+        genome[:] = [self.__dna[slot, :dimension] for (slot, dimension) in zip(live, dimensions)]
+        return genome
+
+
+def build_random_individual(dimension: int, dna_builder: DnaBuilder, rng: Optional[np.random.Generator] = None) -> Individual:
+    rng = get_rng(rng)
+    mask = np.repeat(rng.normal(0, 1), dimension)
+    dna = dna_builder.get(dimension, rng)
     return build_individual(dna, mask)
 
 
-def __add_to_population(population: Population, dimension: int, fitness_function: Fitness, dna_builder: DnaBuilder) -> None:
-    individual = build_random_individual(dimension, dna_builder)
-    fitness = fitness_function.fitness(individual)
-    population.add(individual, fitness)
+def __add_to_population(
+        population: Population,
+        dimensions: np.ndarray,
+        fitness_function: Fitness,
+        dna_builder: DnaBuilder,
+        evaluator: Optional[Evaluator],
+        rng: Optional[np.random.Generator]
+) -> None:
+    evaluator = evaluator if evaluator is not None else SerialEvaluator()
+    rng = get_rng(rng)
+    # individuals sharing a dimension are drawn, evaluated and stored as a single batch.
+    for (dimension, size) in zip(*np.unique(dimensions, return_counts=True)):
+        dna = dna_builder.get_batch(int(size), int(dimension), rng)
+        mask = np.repeat(rng.normal(0, 1, (size, 1)), dimension, axis=1)
+        population.add_batch(dna, mask, evaluator.evaluate(fitness_function, dna))
 
 
 def build_fixed_dimension_population(
         dimension: int,
         initial_size: int,
         fitness_function: Fitness,
-        dna_builder: DnaBuilder
+        dna_builder: DnaBuilder,
+        evaluator: Optional[Evaluator] = None,
+        rng: Optional[np.random.Generator] = None
 ) -> Population:
     """Function to create a population of individuals with a fixed dimension.
 
@@ -149,16 +433,22 @@ def build_fixed_dimension_population(
     :param int initial_size: Initial size of the population in terms of number of individuals.
     :param Fitness fitness_function: Fitness function to evaluate the individuals.
     :param DnaBuilder dna_builder: DnaBuilder to create the individuals.
+    :param Evaluator evaluator: Evaluator used to compute the fitness of the individuals (serial by default).
+    :param Generator rng: random Generator used to draw the individuals (the default one if not given).
     """
     population = Population()
-    for _ in range(0, initial_size):
-        __add_to_population(population, dimension, fitness_function, dna_builder)
+    __add_to_population(population, np.full(initial_size, dimension), fitness_function, dna_builder, evaluator, rng)
     return population
 
 
-def build_variable_dimension_population(initial_size: int, fitness_function: Fitness, dna_builder: DnaBuilder) -> Population:
+def build_variable_dimension_population(
+        initial_size: int,
+        fitness_function: Fitness,
+        dna_builder: DnaBuilder,
+        evaluator: Optional[Evaluator] = None,
+        rng: Optional[np.random.Generator] = None
+) -> Population:
     population = Population()
-    for _ in range(0, initial_size):
-        dimension = np.random.randint(1, 10)
-        __add_to_population(population, dimension, fitness_function, dna_builder)
+    dimensions = get_rng(rng).integers(1, 10, initial_size)
+    __add_to_population(population, dimensions, fitness_function, dna_builder, evaluator, rng)
     return population
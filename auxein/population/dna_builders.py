@@ -2,17 +2,26 @@
 """
 from __future__ import absolute_import
 from abc import ABC, abstractmethod
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 import numpy as np
 
+from auxein.rng import get_rng
+
 
 class DnaBuilder(ABC):
 
     @abstractmethod
-    def get(self, dimension: int) -> np.ndarray:
+    def get(self, dimension: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
         pass
 
+    def get_batch(self, size: int, dimension: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Builds `size` dna sequences at once, as a matrix with one row per sequence.
+        The default implementation calls `get` for every row.
+        """
+        assert dimension > 0, 'dna dimension must be strictly positive.'
+        return np.array([self.get(dimension, rng) for _ in range(size)], dtype=float).reshape(size, dimension)
+
 
 class RandomDnaBuilder(DnaBuilder):
 
@@ -24,7 +33,7 @@ class RandomDnaBuilder(DnaBuilder):
         return self._distribution
 
     @abstractmethod
-    def get(self, dimension: int) -> np.ndarray:
+    def get(self, dimension: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
         pass
 
 
@@ -34,12 +43,15 @@ class UniformRandomDnaBuilder(RandomDnaBuilder):
         super().__init__(distribution='uniform')
         self.interval = interval
 
-    def get(self, dimension: int) -> np.ndarray:
+    def get(self, dimension: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        return self.get_batch(1, dimension, rng)[0]
+
+    def get_batch(self, size: int, dimension: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
         assert dimension > 0, 'dna dimension must be strictly positive.'
-        return np.random.uniform(
+        return get_rng(rng).uniform(
             self.interval[0],
             self.interval[1],
-            dimension
+            (size, dimension)
         )
 
 
@@ -50,12 +62,15 @@ class NormalRandomDnaBuilder(RandomDnaBuilder):
         self.mean = mean
         self.std = std
 
-    def get(self, dimension: int) -> np.ndarray:
+    def get(self, dimension: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        return self.get_batch(1, dimension, rng)[0]
+
+    def get_batch(self, size: int, dimension: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
         assert dimension > 0, 'dna dimension must be strictly positive.'
-        return np.random.normal(
+        return get_rng(rng).normal(
             self.mean,
             self.std,
-            dimension
+            (size, dimension)
         )
 
 
@@ -68,12 +83,15 @@ class CompositeDnaBuilder(RandomDnaBuilder):
         super().__init__(distribution='composite')
         self.builders = builders
 
-    def get(self, dimension: int) -> np.ndarray:
+    def get(self, dimension: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        return self.get_batch(1, dimension, rng)[0]
+
+    def get_batch(self, size: int, dimension: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
         assert dimension > 0, 'dna dimension must be strictly positive.'
         assert dimension == sum(map(lambda item: item[1], self.builders)), 'dna dimension must be equal to the sum of the dimensions of the builders.'
 
         dna = []
         for (builder, dimension) in self.builders:
-            dna.append(builder.get(dimension))
+            dna.append(builder.get_batch(size, dimension, rng))
 
-        return np.concatenate(dna)
+        return np.concatenate(dna, axis=1)
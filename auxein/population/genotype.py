@@ -2,16 +2,49 @@
 Contains various genotypes representations.
 """
 from __future__ import absolute_import
+from typing import Optional
 
 import numpy as np
 
 
+def _is_immutable(array: np.ndarray) -> bool:
+    """Tells whether `array` is an ndarray and neither it nor any array it is a view of can be written."""
+    if not isinstance(array, np.ndarray):
+        return False
+    current: Optional[np.ndarray] = array
+    while isinstance(current, np.ndarray):
+        if current.flags.writeable:
+            return False
+        current = current.base
+    return True
+
+
+def _freeze(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
 class Genotype:
+    """An immutable genotype.
+    dna and mask are stored as read-only arrays, so accessors hand out the stored arrays
+    without copying them: mutations and recombinations always produce new arrays.
+    """
 
     def __init__(self, dna: np.ndarray, mask: np.ndarray) -> None:
         self._dimension = len(dna)
-        self._dna = dna.copy()
-        self._mask = mask.copy()
+        self._dna = dna if _is_immutable(dna) else _freeze(np.array(dna))
+        self._mask = mask if _is_immutable(mask) else _freeze(np.array(mask))
+
+    @classmethod
+    def wrap(cls, dna: np.ndarray, mask: np.ndarray) -> 'Genotype':
+        """Builds a genotype taking ownership of freshly allocated arrays, which are made
+        read-only in place instead of being copied. The caller must not keep writing to them.
+        """
+        genotype = cls.__new__(cls)
+        genotype._dimension = len(dna)
+        genotype._dna = _freeze(dna)
+        genotype._mask = _freeze(mask)
+        return genotype
 
     @property
     def dimension(self) -> int:
@@ -19,11 +52,11 @@ class Genotype:
 
     @property
     def dna(self) -> np.ndarray:
-        return self._dna.copy()
+        return self._dna
 
     @property
     def mask(self) -> np.ndarray:
-        return self._mask.copy()
+        return self._mask
 
     def __repr__(self) -> str:
         repr: str = f'({self._dna}),({self._mask})'
@@ -1,29 +1,79 @@
 """Contains the base Individual class.
 """
 from __future__ import absolute_import
-from typing import List, Optional
-from uuid import uuid4, UUID
-import time
+from typing import List, Optional, Union
+from uuid import UUID
+import threading
 
 import numpy as np
 
 from auxein.mutations import Mutation
 from auxein.population.genotype import Genotype
 
+_id_lock = threading.Lock()
+_next_id = 0
+
+
+def new_ids(n: int) -> np.ndarray:
+    """Reserves `n` consecutive ids, greater than any id handed out before in this process."""
+    global _next_id
+    with _id_lock:
+        start = _next_id
+        _next_id += n
+    return np.arange(start, start + n, dtype=np.int64)
+
+
+def new_id() -> int:
+    global _next_id
+    with _id_lock:
+        _next_id += 1
+        return _next_id - 1
+
+
+def as_id(id: Union[int, str]) -> int:
+    """Converts an id given as an integer, as a decimal string (`str(individual.id)`) or in its
+    UUID string export format (`individual.uuid`).
+    """
+    if not isinstance(id, str):
+        return int(id)
+    if id.isdecimal():
+        return int(id)
+    try:
+        return UUID(id).int
+    except ValueError:
+        raise ValueError(f'{id!r} is not an individual id: ids are integers, given either as int, decimal string or UUID string') from None
+
 
 class Individual:
+    """An individual, made of a genotype, an integer id and the generation it was born at.
+    Ids are monotonically increasing integers; `uuid` exports them as UUID strings and
+    UUID strings are accepted as ids, so that ids can be round-tripped.
+    """
+
+    __slots__ = ('_id', '_genotype', '_birth_generation')
 
-    def __init__(self, genotype: Genotype, id: Optional[str] = None) -> None:
-        self._id = uuid4() if id is None else UUID(id)
-        self._born_at = time.time()
+    def __init__(self, genotype: Genotype, id: Optional[Union[int, str]] = None, birth_generation: Optional[int] = None) -> None:
+        self._id = new_id() if id is None else as_id(id)
         self._genotype = genotype
+        self._birth_generation = birth_generation
+
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @property
+    def uuid(self) -> str:
+        return str(UUID(int=self._id))
 
     @property
-    def id(self) -> str:
-        return str(self._id)
+    def birth_generation(self) -> Optional[int]:
+        """Generation the individual was born at, or None if it has not joined a population yet."""
+        return self._birth_generation
 
-    def age(self) -> float:
-        return time.time() - self._born_at
+    def age(self, generation: int) -> int:
+        """Age of the individual, in generations, at the given generation."""
+        assert self._birth_generation is not None, 'the individual has not been born yet'
+        return generation - self._birth_generation
 
     def dimension(self) -> int:
         return self._genotype.dimension
@@ -47,10 +97,14 @@ class Individual:
         return f'[{self._id}],({self._genotype})'
 
 
-def build_individual(dna: List[float], mask: List[float] = None, id: Optional[str] = None) -> Individual:
+def build_individual(
+    dna: Union[List[float], np.ndarray],
+    mask: Optional[Union[List[float], np.ndarray]] = None,
+    id: Optional[Union[int, str]] = None
+) -> Individual:
     """Utility function to build an Individual."""
     return Individual(
-        Genotype(
+        Genotype.wrap(
             np.array(dna),
             np.array(mask) if mask is not None else np.array([]),
         ),
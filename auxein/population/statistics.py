@@ -0,0 +1,174 @@
+"""Contains running statistics used by the population.
+"""
+from __future__ import absolute_import
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+
+class RunningStatistics:
+    """Running count, sum, mean, variance, minimum and maximum of a multiset of values
+    supporting both insertions and removals in O(1) (O(k) for a batch of k values).
+
+    Mean and variance are maintained with Welford's algorithm (and Chan's pairwise update
+    for batches). Minimum and maximum are repaired lazily: removing the current extreme marks
+    them as stale and they are recomputed through `values_provider` the next time they are read.
+    """
+
+    def __init__(self, values_provider: Callable[[], np.ndarray]) -> None:
+        self.__values_provider = values_provider
+        self.reset(np.zeros(0))
+
+    def reset(self, values: np.ndarray) -> None:
+        self.count = int(values.size)
+        self.total = float(np.sum(values))
+        self.mean = self.total / self.count if self.count > 0 else 0.0
+        self.m2 = float(np.sum((values - self.mean)**2)) if self.count > 0 else 0.0
+        self.__set_extremes(values)
+
+    def __set_extremes(self, values: np.ndarray) -> None:
+        self.__min = float(np.min(values)) if values.size > 0 else np.inf
+        self.__max = float(np.max(values)) if values.size > 0 else -np.inf
+        self.__stale = False
+
+    def push(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.__min = min(self.__min, value)
+        self.__max = max(self.__max, value)
+
+    def remove(self, value: float) -> None:
+        if self.count <= 1:
+            self.reset(np.zeros(0))
+            return
+        mean = (self.count * self.mean - value) / (self.count - 1)
+        self.m2 = max(self.m2 - (value - self.mean) * (value - mean), 0.0)
+        self.mean = mean
+        self.count -= 1
+        self.total -= value
+        if value <= self.__min or value >= self.__max:
+            self.__stale = True
+
+    def push_many(self, values: np.ndarray) -> None:
+        if values.size == 0:
+            return
+        count = values.size
+        mean = float(np.mean(values))
+        m2 = float(np.sum((values - mean)**2))
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+        self.total += float(np.sum(values))
+        self.__min = min(self.__min, float(np.min(values)))
+        self.__max = max(self.__max, float(np.max(values)))
+
+    def remove_many(self, values: np.ndarray) -> None:
+        if values.size == 0:
+            return
+        if values.size >= self.count:
+            self.reset(np.zeros(0))
+            return
+        count = values.size
+        mean = float(np.mean(values))
+        m2 = float(np.sum((values - mean)**2))
+        remaining = self.count - count
+        remaining_mean = (self.count * self.mean - count * mean) / remaining
+        delta = mean - remaining_mean
+        self.m2 = max(self.m2 - m2 - delta**2 * remaining * count / self.count, 0.0)
+        self.mean = remaining_mean
+        self.count = remaining
+        self.total -= float(np.sum(values))
+        if np.min(values) <= self.__min or np.max(values) >= self.__max:
+            self.__stale = True
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count > 0 else 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    @property
+    def min(self) -> float:
+        if self.__stale:
+            self.__set_extremes(self.__values_provider())
+        return self.__min
+
+    @property
+    def max(self) -> float:
+        if self.__stale:
+            self.__set_extremes(self.__values_provider())
+        return self.__max
+
+
+class SortedIndex:
+    """Values kept sorted in ascending order, each one tagged with an integer key.
+
+    Values live in a sorted array updated through binary search (`np.searchsorted`), so that
+    the k smallest or largest values are read in O(k) and the extremes in O(1), while single
+    insertions and removals cost a binary search plus a memory move. Equal values keep their
+    insertion order.
+    """
+
+    def __init__(self) -> None:
+        self.reset(np.zeros(0), np.zeros(0, dtype=np.int64))
+
+    def reset(self, values: np.ndarray, keys: np.ndarray) -> None:
+        order = np.argsort(values, kind='stable')
+        self.values = np.asarray(values, dtype=float)[order]
+        self.keys = np.asarray(keys, dtype=np.int64)[order]
+
+    def __len__(self) -> int:
+        return self.values.size
+
+    def insert(self, value: float, key: int) -> None:
+        position = np.searchsorted(self.values, value, side='right')
+        self.values = np.insert(self.values, position, value)
+        self.keys = np.insert(self.keys, position, key)
+
+    def insert_many(self, values: np.ndarray, keys: np.ndarray) -> None:
+        if values.size == 0:
+            return
+        order = np.argsort(values, kind='stable')
+        (values, keys) = (np.asarray(values, dtype=float)[order], np.asarray(keys, dtype=np.int64)[order])
+        positions = np.searchsorted(self.values, values, side='right')
+        self.values = np.insert(self.values, positions, values)
+        self.keys = np.insert(self.keys, positions, keys)
+
+    def remove(self, value: float, key: int) -> None:
+        low = np.searchsorted(self.values, value, side='left')
+        high = np.searchsorted(self.values, value, side='right')
+        matches = np.flatnonzero(self.keys[low:high] == key)
+        if matches.size > 0:
+            self.values = np.delete(self.values, low + matches[0])
+            self.keys = np.delete(self.keys, low + matches[0])
+
+    def remove_many(self, keys: np.ndarray) -> None:
+        if keys.size == 0:
+            return
+        keep = ~np.isin(self.keys, keys)
+        self.values = self.values[keep]
+        self.keys = self.keys[keep]
+
+    def smallest(self, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the k smallest values and their keys, in ascending order."""
+        return (self.values[:k], self.keys[:k])
+
+    def largest(self, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the k largest values and their keys, in descending order."""
+        start = 0 if k is None else max(self.values.size - k, 0)
+        return (self.values[start:][::-1], self.keys[start:][::-1])
+
+    @property
+    def min(self) -> float:
+        return float(self.values[0]) if self.values.size > 0 else np.inf
+
+    @property
+    def max(self) -> float:
+        return float(self.values[-1]) if self.values.size > 0 else -np.inf
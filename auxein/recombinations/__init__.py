@@ -1,4 +1,9 @@
 # flake8: noqa
 from .core import Recombination
 from .core import SimpleArithmetic
+from .core import WholeArithmetic
+from .core import UniformCrossover
+from .core import NPointCrossover
+from .core import OnePointCrossover
+from .core import BlendCrossover
 from .core import MatrixRecombination
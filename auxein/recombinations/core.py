@@ -5,20 +5,47 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from abc import ABC, abstractmethod
-from typing import Tuple, List
+from typing import Optional, Tuple
 
 import numpy as np
 
+from auxein.rng import get_rng
+
 
 class Recombination(ABC):
+    """Abstract class for recombinations.
+
+    `recombine` mates a single couple of parents, while `recombine_batch` mates a batch of couples
+    given as two matrices of parents' dna, with the i-th rows of both matrices being the i-th couple.
+    """
 
     def __init__(self, allow_uneven: bool = False):
         self.allow_uneven = allow_uneven
 
     @abstractmethod
-    def recombine(self, parent1_dna: np.ndarray, parent2_dna: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    def recombine(self, parent1_dna: np.ndarray, parent2_dna: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
         pass
 
+    def recombine_batch(self, parents_a: np.ndarray, parents_b: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Recombines a batch of couples, returning the matrices of the first and second children.
+        The default implementation falls back to `recombine` for every couple.
+        """
+        assert parents_a.shape == parents_b.shape, 'batches of parents must have the same shape'
+        children = [self.recombine(a, b) if rng is None else self.recombine(a, b, rng) for (a, b) in zip(parents_a, parents_b)]
+        return (
+            np.array([c[0] for c in children]).reshape(parents_a.shape),
+            np.array([c[1] for c in children]).reshape(parents_b.shape)
+        )
+
+    def _recombine_as_batch(self, parent1_dna: np.ndarray, parent2_dna: np.ndarray, rng: Optional[np.random.Generator]) -> Tuple[np.ndarray, np.ndarray]:
+        assert len(parent1_dna) == len(parent2_dna), 'dna of parents must be of the same dimension'
+        (children_a, children_b) = self.recombine_batch(
+            np.asarray(parent1_dna)[np.newaxis, :],
+            np.asarray(parent2_dna)[np.newaxis, :],
+            rng
+        )
+        return (children_a[0], children_b[0])
+
 
 class SimpleArithmetic(Recombination):
 
@@ -26,17 +53,15 @@ class SimpleArithmetic(Recombination):
         super().__init__(allow_uneven=allow_uneven)
         self.alpha = alpha
 
-    def __linear_combination(self, arr1: np.ndarray, arr2: np.ndarray) -> List[float]:
-        result: List[float] = []
-        for (i1, i2) in zip(arr1, arr2):
-            result.append(self.alpha * i2 + (1 - self.alpha) * i1)
-        return result
+    def __linear_combination(self, arr1: np.ndarray, arr2: np.ndarray) -> np.ndarray:
+        size = min(len(arr1), len(arr2))
+        return self.alpha * arr2[:size] + (1 - self.alpha) * arr1[:size]
 
-    def recombine(self, parent1_dna: np.ndarray, parent2_dna: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    def recombine(self, parent1_dna: np.ndarray, parent2_dna: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
         if not self.allow_uneven:
             assert len(parent1_dna) == len(parent2_dna), 'dna of parents must be of the same dimension'
 
-        cross_over_point = np.random.randint(0, min(len(parent1_dna), len(parent2_dna)))
+        cross_over_point = get_rng(rng).integers(0, min(len(parent1_dna), len(parent2_dna)))
         child1_dna = np.concatenate(
             (
                 parent1_dna[:cross_over_point],
@@ -63,10 +88,115 @@ class SimpleArithmetic(Recombination):
 
         return (child1_dna, child2_dna)
 
+    def recombine_batch(self, parents_a: np.ndarray, parents_b: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        assert parents_a.shape == parents_b.shape, 'batches of parents must have the same shape'
+        (n, d) = parents_a.shape
+        cross_over_points = get_rng(rng).integers(0, d, n)
+        tails = np.arange(d) >= cross_over_points[:, np.newaxis]
+        return (
+            np.where(tails, self.alpha * parents_b + (1 - self.alpha) * parents_a, parents_a),
+            np.where(tails, self.alpha * parents_a + (1 - self.alpha) * parents_b, parents_b)
+        )
+
+
+class WholeArithmetic(Recombination):
+    """Whole arithmetic recombination: children are the weighted averages
+    α·parent2 + (1 - α)·parent1 and α·parent1 + (1 - α)·parent2.
+    """
+
+    def __init__(self, alpha: float) -> None:
+        super().__init__()
+        self.alpha = alpha
+
+    def recombine(self, parent1_dna: np.ndarray, parent2_dna: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        return self._recombine_as_batch(parent1_dna, parent2_dna, rng)
+
+    def recombine_batch(self, parents_a: np.ndarray, parents_b: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        assert parents_a.shape == parents_b.shape, 'batches of parents must have the same shape'
+        return (
+            self.alpha * parents_b + (1 - self.alpha) * parents_a,
+            self.alpha * parents_a + (1 - self.alpha) * parents_b
+        )
+
+
+class UniformCrossover(Recombination):
+    """Uniform crossover: every gene is swapped between the parents with probability `p`."""
+
+    def __init__(self, p: float = 0.5) -> None:
+        super().__init__()
+        assert 0 <= p <= 1, 'p must be within [0, 1]'
+        self.p = p
+
+    def recombine(self, parent1_dna: np.ndarray, parent2_dna: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        return self._recombine_as_batch(parent1_dna, parent2_dna, rng)
+
+    def recombine_batch(self, parents_a: np.ndarray, parents_b: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        assert parents_a.shape == parents_b.shape, 'batches of parents must have the same shape'
+        swaps = get_rng(rng).random(parents_a.shape) < self.p
+        return (np.where(swaps, parents_b, parents_a), np.where(swaps, parents_a, parents_b))
+
+
+class NPointCrossover(Recombination):
+    """N-point crossover: `n_points` distinct crossover points are drawn for every couple
+    and the segments between them are alternately swapped between the parents.
+    """
+
+    def __init__(self, n_points: int = 1) -> None:
+        super().__init__()
+        assert n_points > 0, 'n_points must be strictly positive'
+        self.n_points = n_points
+
+    def recombine(self, parent1_dna: np.ndarray, parent2_dna: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        return self._recombine_as_batch(parent1_dna, parent2_dna, rng)
+
+    def recombine_batch(self, parents_a: np.ndarray, parents_b: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        assert parents_a.shape == parents_b.shape, 'batches of parents must have the same shape'
+        (n, d) = parents_a.shape
+        assert self.n_points < d, 'n_points must be lower than the dna dimension'
+        # a crossover point k swaps all the genes from position k (in [1, d - 1]) onwards.
+        keys = get_rng(rng).random((n, d - 1))
+        points = np.argpartition(keys, self.n_points - 1, axis=1)[:, :self.n_points] + 1
+        cuts = np.zeros((n, d), dtype=np.int64)
+        cuts[np.arange(n)[:, np.newaxis], points] = 1
+        swaps = np.cumsum(cuts, axis=1) % 2 == 1
+        return (np.where(swaps, parents_b, parents_a), np.where(swaps, parents_a, parents_b))
+
+
+class OnePointCrossover(NPointCrossover):
+
+    def __init__(self) -> None:
+        super().__init__(n_points=1)
+
+
+class BlendCrossover(Recombination):
+    """Blend crossover (BLX-α): every gene of the children is drawn uniformly within the interval
+    spanned by the parents' genes, extended on both sides by α times its width.
+    """
+
+    def __init__(self, alpha: float = 0.5) -> None:
+        super().__init__()
+        assert alpha >= 0, 'alpha must be non-negative'
+        self.alpha = alpha
+
+    def recombine(self, parent1_dna: np.ndarray, parent2_dna: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        return self._recombine_as_batch(parent1_dna, parent2_dna, rng)
+
+    def recombine_batch(self, parents_a: np.ndarray, parents_b: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        assert parents_a.shape == parents_b.shape, 'batches of parents must have the same shape'
+        rng = get_rng(rng)
+        lower = np.minimum(parents_a, parents_b)
+        upper = np.maximum(parents_a, parents_b)
+        extension = self.alpha * (upper - lower)
+        return (
+            rng.uniform(lower - extension, upper + extension),
+            rng.uniform(lower - extension, upper + extension)
+        )
+
 
 class MatrixRecombination(Recombination):
 
     def __init__(self, shape: Tuple[int, int], recombination: Recombination) -> None:
+        super().__init__()
         self._shape = shape
         self.recombination = recombination
 
@@ -77,14 +207,31 @@ class MatrixRecombination(Recombination):
     def __to_matrix(self, vector: np.ndarray) -> np.ndarray:
         return vector.reshape(self._shape)
 
-    def recombine(self, parent1_dna: np.ndarray, parent2_dna: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    def recombine(self, parent1_dna: np.ndarray, parent2_dna: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
         vectorised_parent1_dna = self.__vectorise(parent1_dna)
         vectorised_parent2_dna = self.__vectorise(parent2_dna)
         (vectorised_child_1, vectorised_child_2) = self.recombination.recombine(
             vectorised_parent1_dna,
             vectorised_parent2_dna
+        ) if rng is None else self.recombination.recombine(
+            vectorised_parent1_dna,
+            vectorised_parent2_dna,
+            rng
         )
         return (
             self.__to_matrix(vectorised_child_1),
             self.__to_matrix(vectorised_child_2)
         )
+
+    def recombine_batch(self, parents_a: np.ndarray, parents_b: np.ndarray, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Recombines a batch of matrix parents, given either as (n, rows, columns) arrays
+        or as (n, rows * columns) arrays of flattened matrices.
+        """
+        assert parents_a.shape == parents_b.shape, 'batches of parents must have the same shape'
+        n = parents_a.shape[0]
+        (children_a, children_b) = self.recombination.recombine_batch(
+            parents_a.reshape((n, -1)),
+            parents_b.reshape((n, -1)),
+            rng
+        )
+        return (children_a.reshape(parents_a.shape), children_b.reshape(parents_b.shape))
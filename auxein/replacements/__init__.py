@@ -1,3 +1,8 @@
 # flake8: noqa
 from .core import Replacement
 from .core import ReplaceWorst
+from .core import ArrayReplacement
+from .core import ElitistReplacement
+from .core import CommaReplacement
+from .core import AgeBasedReplacement
+from .core import RoundRobinTournamentReplacement
@@ -1,16 +1,18 @@
 # -*- coding: utf-8 -*-
-"""Static playground.
+"""Core Auxein replacements.
 """
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional, Tuple
 
 import numpy as np
 
+from auxein.evaluators import Evaluator, SerialEvaluator
 from auxein.fitness import Fitness
-from auxein.population import Population, Individual
+from auxein.population import Population, Individual, build_individual
+from auxein.rng import get_rng
 
 
 class Replacement(ABC):
@@ -18,25 +20,295 @@ class Replacement(ABC):
     def __init__(self, offspring_size: int) -> None:
         self.offspring_size = offspring_size
 
-    def _replace(self, quantity: int, offspring: List[Individual], population: Population, individuals_to_kill: List[str], fitness_function: Fitness) -> None:
-        for i in individuals_to_kill:
-            population.kill(i)
+    def _replace(
+        self,
+        quantity: int,
+        offspring: List[Individual],
+        population: Population,
+        individuals_to_kill: List[int],
+        fitness_function: Fitness,
+        evaluator: Optional[Evaluator] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> None:
+        evaluator = evaluator if evaluator is not None else SerialEvaluator()
+        population.kill_batch(individuals_to_kill)
 
-        children: List[Individual] = np.random.choice(offspring, quantity, replace=False)
-        for child in children:
-            population.add(child, fitness_function.fitness(child))
+        children: List[Individual] = [offspring[c] for c in get_rng(rng).choice(len(offspring), quantity, replace=False)]
+        fitness_values = evaluator.evaluate_genomes(fitness_function, [child.genotype.dna for child in children])
+        for (child, fitness) in zip(children, fitness_values):
+            population.add(child, fitness)
+
+    def _replace_batch(
+        self,
+        quantity: int,
+        dna: np.ndarray,
+        mask: np.ndarray,
+        population: Population,
+        individuals_to_kill: List[int],
+        fitness_function: Fitness,
+        evaluator: Optional[Evaluator] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> None:
+        evaluator = evaluator if evaluator is not None else SerialEvaluator()
+        children = get_rng(rng).choice(dna.shape[0], quantity, replace=False)
+        fitness_values = evaluator.evaluate(fitness_function, dna[children])
+        self._replace_evaluated(dna[children], mask[children], fitness_values, population, individuals_to_kill)
+
+    def _replace_evaluated(
+        self,
+        dna: np.ndarray,
+        mask: np.ndarray,
+        fitness: np.ndarray,
+        population: Population,
+        individuals_to_kill: List[int]
+    ) -> None:
+        """Kills `individuals_to_kill` and adds all the given, already evaluated, children."""
+        population.kill_batch(individuals_to_kill)
+        population.add_batch(dna, mask, fitness)
+
+    def offspring_demand(self, population: Population, available: int) -> int:
+        """Returns how many of `available` children `replace` would keep for `population`,
+        so that playgrounds can breed only as many children as needed.
+        A demand greater than `available` asks playgrounds for more children than offered.
+        By default every child may be kept.
+        """
+        return available
 
     @abstractmethod
-    def replace(self, offspring: List[Individual], population: Population, fitness_function: Fitness) -> None:
+    def replace(
+        self,
+        offspring: List[Individual],
+        population: Population,
+        fitness_function: Fitness,
+        evaluator: Optional[Evaluator] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> None:
         pass
 
+    def replace_batch(
+        self,
+        dna: np.ndarray,
+        mask: np.ndarray,
+        population: Population,
+        fitness_function: Fitness,
+        evaluator: Optional[Evaluator] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> None:
+        """Replaces individuals of the population with an offspring given as a dna matrix
+        and a mask matrix, one row per child.
+        Subclasses may override it to avoid building an `Individual` for every child; by default
+        the offspring is materialised and handed over to `replace`.
+        """
+        offspring = [build_individual(dna[c], mask[c]) for c in range(dna.shape[0])]
+        self.replace(offspring, population, fitness_function, evaluator, rng)
+
+    def replace_evaluated(
+        self,
+        dna: np.ndarray,
+        mask: np.ndarray,
+        fitness: np.ndarray,
+        population: Population,
+        rng: Optional[np.random.Generator] = None
+    ) -> None:
+        """As `replace_batch`, for children whose fitness is already known (e.g. evaluated
+        asynchronously), which are therefore not evaluated again.
+        By default as many children as `offspring_demand` replace the worst individuals.
+        """
+        quantity = min(self.offspring_demand(population, dna.shape[0]), dna.shape[0])
+        individuals_to_kill: List[int] = [item[0] for item in population.rank_by_fitness(quantity, reverse=False)]
+        children = get_rng(rng).choice(dna.shape[0], quantity, replace=False)
+        self._replace_evaluated(dna[children], mask[children], fitness[children], population, individuals_to_kill)
+
 
 class ReplaceWorst(Replacement):
 
     def __init__(self, offspring_size: int) -> None:
         super().__init__(offspring_size=offspring_size)
 
-    def replace(self, offspring: List[Individual], population: Population, fitness_function: Fitness) -> None:
-        quantity = population.size() if self.offspring_size >= population.size() else min(self.offspring_size, len(offspring))
-        individuals_to_kill: List[str] = list(map(lambda item : item[0], population.rank_by_fitness(quantity, reverse=False)))
-        super()._replace(quantity, offspring, population, individuals_to_kill, fitness_function)
+    def offspring_demand(self, population: Population, available: int) -> int:
+        return min(self.offspring_size, population.size(), available)
+
+    def replace(
+        self,
+        offspring: List[Individual],
+        population: Population,
+        fitness_function: Fitness,
+        evaluator: Optional[Evaluator] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> None:
+        quantity = self.offspring_demand(population, len(offspring))
+        individuals_to_kill: List[int] = list(map(lambda item : item[0], population.rank_by_fitness(quantity, reverse=False)))
+        super()._replace(quantity, offspring, population, individuals_to_kill, fitness_function, evaluator, rng)
+
+    def replace_batch(
+        self,
+        dna: np.ndarray,
+        mask: np.ndarray,
+        population: Population,
+        fitness_function: Fitness,
+        evaluator: Optional[Evaluator] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> None:
+        quantity = self.offspring_demand(population, dna.shape[0])
+        individuals_to_kill: List[int] = list(map(lambda item : item[0], population.rank_by_fitness(quantity, reverse=False)))
+        super()._replace_batch(quantity, dna, mask, population, individuals_to_kill, fitness_function, evaluator, rng)
+
+
+def _scaled(values: np.ndarray) -> np.ndarray:
+    """Maps values to [0, 0.5] preserving their order, with NaN (not evaluated) lowest,
+    so that they can break ties between integer keys such as ages or wins.
+    """
+    values = np.where(np.isnan(values), -np.inf, values)
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return np.zeros(values.size)
+    (low, high) = (np.min(finite), np.max(finite))
+    scaled = (np.clip(values, low, high) - low) / (high - low) if high > low else np.zeros(values.size)
+    return 0.5 * scaled
+
+
+def _top(keys: np.ndarray, k: int) -> np.ndarray:
+    """Indexes of the k largest keys, in no particular order."""
+    if k >= keys.size:
+        return np.arange(keys.size)
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.argpartition(-keys, k - 1)[:k]
+
+
+class ArrayReplacement(Replacement):
+    """Base class for replacements deciding survivors on fitness and age arrays.
+    Subclasses implement `_partition`, which tells, given the fitness of the evaluated
+    children, which individuals of the population die and which children join it.
+    Dead individuals are killed and surviving children are added as a single batch, so
+    that the latter are written into the freed storage slots with one bulk assignment.
+    """
+
+    def offspring_demand(self, population: Population, available: int) -> int:
+        return min(self.offspring_size, available)
+
+    @abstractmethod
+    def _partition(self, population: Population, children_fitness: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the positions (in population order) of the individuals to kill and the
+        indexes of the children that survive.
+        """
+        pass
+
+    def __pick_children(self, population: Population, available: int, rng: np.random.Generator) -> np.ndarray:
+        return rng.choice(available, min(self.offspring_demand(population, available), available), replace=False)
+
+    def __survive(self, dna: np.ndarray, mask: np.ndarray, fitness: np.ndarray, population: Population, rng: np.random.Generator) -> None:
+        (dead, survivors) = self._partition(population, fitness, rng)
+        super()._replace_evaluated(dna[survivors], mask[survivors], fitness[survivors], population, population.ids()[dead].tolist())
+
+    def replace(
+        self,
+        offspring: List[Individual],
+        population: Population,
+        fitness_function: Fitness,
+        evaluator: Optional[Evaluator] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> None:
+        evaluator = evaluator if evaluator is not None else SerialEvaluator()
+        rng = get_rng(rng)
+        children = self.__pick_children(population, len(offspring), rng)
+        fitness_values = evaluator.evaluate_genomes(fitness_function, [offspring[c].genotype.dna for c in children])
+        (dead, survivors) = self._partition(population, fitness_values, rng)
+        population.kill_batch(population.ids()[dead])
+        for c in survivors:
+            population.add(offspring[children[c]], float(fitness_values[c]))
+
+    def replace_batch(
+        self,
+        dna: np.ndarray,
+        mask: np.ndarray,
+        population: Population,
+        fitness_function: Fitness,
+        evaluator: Optional[Evaluator] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> None:
+        evaluator = evaluator if evaluator is not None else SerialEvaluator()
+        rng = get_rng(rng)
+        children = self.__pick_children(population, dna.shape[0], rng)
+        fitness_values = evaluator.evaluate(fitness_function, dna[children])
+        self.__survive(dna[children], mask[children], fitness_values, population, rng)
+
+    def replace_evaluated(
+        self,
+        dna: np.ndarray,
+        mask: np.ndarray,
+        fitness: np.ndarray,
+        population: Population,
+        rng: Optional[np.random.Generator] = None
+    ) -> None:
+        rng = get_rng(rng)
+        children = self.__pick_children(population, dna.shape[0], rng)
+        self.__survive(dna[children], mask[children], fitness[children], population, rng)
+
+
+class ElitistReplacement(ArrayReplacement):
+    """(μ + λ) replacement: parents and children compete together and the best μ,
+    μ being the current population size, survive.
+    """
+
+    def _partition(self, population: Population, children_fitness: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        fitness = np.concatenate((population.fitness_values(), children_fitness))
+        mu = population.size()
+        kept = _top(np.where(np.isnan(fitness), -np.inf, fitness), mu)
+        alive = np.zeros(fitness.size, dtype=bool)
+        alive[kept] = True
+        return (np.flatnonzero(~alive[:mu]), np.flatnonzero(alive[mu:]))
+
+
+class CommaReplacement(ArrayReplacement):
+    """(μ, λ) replacement: the whole population is replaced by the best μ children,
+    hence at least μ children are required. It demands λ = max(`offspring_size`, μ) children,
+    which the `Static` playground breeds even when its selection yields fewer, as long as
+    pruning does not leave less than μ of them.
+    """
+
+    def offspring_demand(self, population: Population, available: int) -> int:
+        return max(self.offspring_size, population.size())
+
+    def _partition(self, population: Population, children_fitness: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        mu = population.size()
+        assert children_fitness.size >= mu, f'(μ, λ) replacement needs at least {mu} children'
+        survivors = _top(np.where(np.isnan(children_fitness), -np.inf, children_fitness), mu)
+        return (np.arange(mu), survivors)
+
+
+class AgeBasedReplacement(ArrayReplacement):
+    """Age-based replacement: every child replaces one of the oldest individuals.
+    Individuals born at the same generation are replaced from the worst.
+    """
+
+    def offspring_demand(self, population: Population, available: int) -> int:
+        return min(self.offspring_size, population.size(), available)
+
+    def _partition(self, population: Population, children_fitness: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        # the older and, among peers, the worse the higher the key.
+        keys = -(population.birth_generations() + _scaled(population.fitness_values()))
+        return (_top(keys, children_fitness.size), np.arange(children_fitness.size))
+
+
+class RoundRobinTournamentReplacement(ArrayReplacement):
+    """Round-robin tournament replacement, as in evolutionary programming: parents and
+    children meet `opponents` random opponents each, score a win every time their fitness
+    is not worse, and the μ with the most wins survive (ties go to the fitter).
+    """
+
+    def __init__(self, offspring_size: int, opponents: int = 10) -> None:
+        assert opponents > 0, 'opponents must be strictly positive'
+        super().__init__(offspring_size=offspring_size)
+        self.opponents = opponents
+
+    def _partition(self, population: Population, children_fitness: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        fitness = np.concatenate((population.fitness_values(), children_fitness))
+        fitness = np.where(np.isnan(fitness), -np.inf, fitness)
+        mu = population.size()
+        opponents = rng.integers(0, fitness.size, (fitness.size, self.opponents))
+        wins = np.count_nonzero(fitness[:, np.newaxis] >= fitness[opponents], axis=1)
+        kept = _top(wins + _scaled(fitness), mu)
+        alive = np.zeros(fitness.size, dtype=bool)
+        alive[kept] = True
+        return (np.flatnonzero(~alive[:mu]), np.flatnonzero(alive[mu:]))
@@ -0,0 +1,19 @@
+"""Random number generation utilities.
+"""
+from __future__ import absolute_import
+from typing import Optional
+
+import numpy as np
+
+_default_rng = np.random.default_rng()
+
+
+def get_rng(rng: Optional[np.random.Generator] = None) -> np.random.Generator:
+    """Returns `rng` if given, otherwise the module-wide default Generator."""
+    return rng if rng is not None else _default_rng
+
+
+def seed(value: Optional[int] = None) -> None:
+    """Re-seeds the module-wide default Generator."""
+    global _default_rng
+    _default_rng = np.random.default_rng(value)
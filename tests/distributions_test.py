@@ -1,8 +1,8 @@
 import numpy as np
 
 from auxein.fitness import Fitness
-from auxein.population import build_individual, Population
-from auxein.parents.distributions import Fps, FpsWithWindowing, SigmaScaling
+from auxein.population import build_individual, as_id, Population
+from auxein.parents.distributions import Fps, FpsWithWindowing, SigmaScaling, LinearRanking, ExponentialRanking, Boltzmann
 
 
 def init_population(dimension, size, fitness_function):
@@ -31,11 +31,10 @@ def test_fps_constant_fitness_function():
             pass
 
     population = init_population(2, 5, TestFitnessFunction())
-    distribution = Fps().get(population)
-    assert len(distribution) == 5
-    assert all(d[1] == 0.2 for d in distribution)
-    distribution_sum = sum(d[1] for d in distribution)
-    assert np.isclose(distribution_sum, 1)
+    (ids, probabilities) = Fps().get(population)
+    assert len(ids) == len(probabilities) == 5
+    assert all(p == 0.2 for p in probabilities)
+    assert np.isclose(np.sum(probabilities), 1)
 
 
 def test_fps_non_constant_fitness_function():
@@ -47,10 +46,9 @@ def test_fps_non_constant_fitness_function():
             pass
 
     population = init_population(2, 5, TestFitnessFunction())
-    distribution = Fps().get(population)
-    assert len(distribution) == 5
-    distribution_sum = sum(d[1] for d in distribution)
-    assert np.isclose(distribution_sum, 1)
+    (ids, probabilities) = Fps().get(population)
+    assert len(ids) == len(probabilities) == 5
+    assert np.isclose(np.sum(probabilities), 1)
 
 
 def test_fps_known_fitness_function():
@@ -65,14 +63,12 @@ def test_fps_known_fitness_function():
             pass
 
     population = init_population(2, 5, TestFitnessFunction())
-    distribution = Fps().get(population)
-    assert len(distribution) == 5
-    distribution_sum = sum(d[1] for d in distribution)
-    assert np.isclose(distribution_sum, 1)
+    (ids, probabilities) = Fps().get(population)
+    assert len(ids) == len(probabilities) == 5
+    assert np.isclose(np.sum(probabilities), 1)
 
-    distribution_values = list(map(lambda d : d[1], distribution))
     assert np.allclose(
-        np.array(distribution_values),
+        probabilities,
         np.array([0.0666, 0.1333, 0.2, 0.2666, 0.333]),
         rtol=0.001, atol=0.001
     )
@@ -90,14 +86,12 @@ def test_fps_windowing_with_known_fitness_function():
             pass
 
     population = init_population(2, 5, TestFitnessFunction())
-    distribution = FpsWithWindowing().get(population)
-    assert len(distribution) == 5
-    distribution_sum = sum(d[1] for d in distribution)
-    assert np.isclose(distribution_sum, 1)
+    (ids, probabilities) = FpsWithWindowing().get(population)
+    assert len(ids) == len(probabilities) == 5
+    assert np.isclose(np.sum(probabilities), 1)
 
-    distribution_values = list(map(lambda d : d[1], distribution))
     assert np.allclose(
-        np.array(distribution_values),
+        probabilities,
         np.array([0, 0.045, 0.045, 0.045, 0.863]),
         rtol=0.001, atol=0.001
     )
@@ -113,9 +107,8 @@ def test_fps_windowing_non_constant_fitness_function():
             pass
 
     population = init_population(2, 5, TestFitnessFunction())
-    distribution = FpsWithWindowing().get(population)
-    distribution_sum = sum(d[1] for d in distribution)
-    assert np.isclose(distribution_sum, 1)
+    (_, probabilities) = FpsWithWindowing().get(population)
+    assert np.isclose(np.sum(probabilities), 1)
 
 
 def test_fps_sigma_scaling_with_known_fitness_function():
@@ -130,14 +123,12 @@ def test_fps_sigma_scaling_with_known_fitness_function():
             pass
 
     population = init_population(2, 5, TestFitnessFunction())
-    distribution = SigmaScaling().get(population)
-    assert len(distribution) == 5
-    distribution_sum = sum(d[1] for d in distribution)
-    assert np.isclose(distribution_sum, 1)
+    (ids, probabilities) = SigmaScaling().get(population)
+    assert len(ids) == len(probabilities) == 5
+    assert np.isclose(np.sum(probabilities), 1)
 
-    distribution_values = list(map(lambda d : d[1], distribution))
     assert np.allclose(
-        np.array(distribution_values),
+        probabilities,
         np.array([0.139, 0.153, 0.153, 0.153, 0.399]),
         rtol=0.001, atol=0.001
     )
@@ -145,11 +136,44 @@ def test_fps_sigma_scaling_with_known_fitness_function():
 
 def test_fps_sigma_scaling_with_known_values():
     population = build_fully_specified_population()
-    distribution = SigmaScaling().get(population)
-    assert len(distribution) == 3
-    distribution_sum = sum(d[1] for d in distribution)
-    assert np.isclose(distribution_sum, 1)
-    assert (('3adee626-de78-4f83-84f9-ebde4e8ee64d', 0.5374574785652648) in distribution)
-
-    assert (('e2ee1fd8-7bb9-4556-9435-cd012b0f5403', 0.3333333333333333) in distribution)
-    assert (('01f4eadc-e799-42d1-bc18-0fd85159bfb6', 0.12920918810140183) in distribution)
+    (ids, probabilities) = SigmaScaling().get(population)
+    assert len(ids) == 3
+    assert np.isclose(np.sum(probabilities), 1)
+    distribution = dict(zip(ids, probabilities))
+    assert np.isclose(distribution[as_id('3adee626-de78-4f83-84f9-ebde4e8ee64d')], 0.5374574785652648)
+    assert np.isclose(distribution[as_id('e2ee1fd8-7bb9-4556-9435-cd012b0f5403')], 0.3333333333333333)
+    assert np.isclose(distribution[as_id('01f4eadc-e799-42d1-bc18-0fd85159bfb6')], 0.12920918810140183)
+
+
+def test_fps_with_negative_fitness():
+    population = Population()
+    population.add(build_individual([0.1, 0.9], []), -1.0)
+    population.add(build_individual([0.1, 0.5], []), -2.0)
+    population.add(build_individual([0.1, 0.1], []), -4.0)
+    (_, probabilities) = Fps().get(population)
+    assert np.allclose(probabilities, [0.6, 0.4, 0.0])
+
+
+def test_distributions_with_constant_fitness_are_uniform():
+    fitness = np.zeros(4)
+    for distribution in (Fps(), FpsWithWindowing(), SigmaScaling(), LinearRanking(), ExponentialRanking(), Boltzmann()):
+        assert np.allclose(distribution.probabilities(fitness[:1]), [1.0])
+    for distribution in (Fps(), FpsWithWindowing(), SigmaScaling(), Boltzmann()):
+        assert np.allclose(distribution.probabilities(fitness), 0.25)
+
+
+def test_linear_ranking():
+    probabilities = LinearRanking(2).probabilities(np.array([-3.0, -1.0, -2.0]))
+    assert np.allclose(probabilities, [0, 2 / 3, 1 / 3])
+    probabilities = LinearRanking(1.5).probabilities(np.random.uniform(-1, 1, 10))
+    assert np.isclose(np.sum(probabilities), 1)
+
+
+def test_exponential_ranking():
+    probabilities = ExponentialRanking(0.5).probabilities(np.array([-3.0, -1.0, -2.0]))
+    assert np.allclose(probabilities, [1 / 7, 4 / 7, 2 / 7])
+
+
+def test_boltzmann():
+    probabilities = Boltzmann(temperature=1.0).probabilities(np.array([-1000.0, -1001.0]))
+    assert np.allclose(probabilities, [1 / (1 + np.exp(-1)), np.exp(-1) / (1 + np.exp(-1))])
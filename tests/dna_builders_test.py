@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock
 import numpy as np
 
 from auxein.population.dna_builders import UniformRandomDnaBuilder, NormalRandomDnaBuilder, CompositeDnaBuilder
@@ -18,15 +18,25 @@ def test_uniform_random_dna_builder_values():
         assert -1 < dna[1] < 1
 
 
-@patch('numpy.random.normal')
-def test_normal_random_dna_builder_instantiation(mock_np_normal):
-
-    mock_np_normal.return_value = [0.5, -1.3]
+def test_normal_random_dna_builder_instantiation():
+    rng = MagicMock()
+    rng.normal.return_value = np.array([[0.5, -1.3]])
 
     builder = NormalRandomDnaBuilder()
     assert builder.get_distribution() == 'normal'
-    assert len(builder.get(2)) == 2
-    mock_np_normal.assert_called_once_with(0.0, 1.0, 2)
+    assert len(builder.get(2, rng)) == 2
+    rng.normal.assert_called_once_with(0.0, 1.0, (1, 2))
+
+
+def test_dna_builders_batches_are_reproducible():
+    builder = CompositeDnaBuilder([
+        (UniformRandomDnaBuilder(interval=(-1, 0)), 2),
+        (NormalRandomDnaBuilder(), 3),
+    ])
+    dna = builder.get_batch(4, 5, np.random.default_rng(11))
+    assert dna.shape == (4, 5)
+    assert np.all((-1 < dna[:, :2]) & (dna[:, :2] < 0))
+    assert np.array_equal(dna, builder.get_batch(4, 5, np.random.default_rng(11)))
 
 
 def test_composite_random_dna_builder_values():
@@ -0,0 +1,72 @@
+import numpy as np
+
+from auxein.fitness import Fitness
+from auxein.evaluators import SerialEvaluator, ThreadPoolEvaluator, ProcessPoolEvaluator
+from auxein.population import build_fixed_dimension_population
+from auxein.population.dna_builders import UniformRandomDnaBuilder
+from auxein.rng import get_rng
+
+
+class SumFitnessFunction(Fitness):
+    def fitness(self, individual):
+        return float(np.sum(individual.genotype.dna))
+
+    def fitness_batch(self, genomes):
+        return np.sum(genomes, axis=1)
+
+    def value(self, individual, x):
+        pass
+
+
+def test_serial_evaluator():
+    genomes = np.random.uniform(-1, 1, (10, 3))
+    assert np.array_equal(SerialEvaluator().evaluate(SumFitnessFunction(), genomes), np.sum(genomes, axis=1))
+
+
+def test_evaluate_uneven_genomes():
+    genomes = [np.array([1.0, 2.0]), np.array([1.0]), np.array([3.0, 4.0]), np.array([1.0, 1.0, 1.0])]
+    assert np.array_equal(SerialEvaluator().evaluate_genomes(SumFitnessFunction(), genomes), [3.0, 1.0, 7.0, 3.0])
+
+
+def test_thread_pool_evaluator():
+    genomes = np.random.uniform(-1, 1, (101, 3))
+    with ThreadPoolEvaluator(max_workers=4) as evaluator:
+        assert np.allclose(evaluator.evaluate(SumFitnessFunction(), genomes), np.sum(genomes, axis=1))
+        assert np.allclose(evaluator.evaluate(SumFitnessFunction(), genomes[:1]), np.sum(genomes[:1], axis=1))
+
+
+def test_process_pool_evaluator():
+    genomes = np.random.uniform(-1, 1, (101, 3))
+    with ProcessPoolEvaluator(max_workers=2, chunk_size=10) as evaluator:
+        assert np.allclose(evaluator.evaluate(SumFitnessFunction(), genomes), np.sum(genomes, axis=1))
+        assert evaluator.evaluate(SumFitnessFunction(), np.zeros((0, 3))).size == 0
+
+
+def test_build_population_with_evaluator():
+    with ThreadPoolEvaluator(max_workers=2, chunk_size=3) as evaluator:
+        population = build_fixed_dimension_population(3, 10, SumFitnessFunction(), UniformRandomDnaBuilder(), evaluator)
+    for item in population.pool:
+        assert np.isclose(item.fitness, np.sum(item.individual.genotype.dna))
+
+
+class NoisyFitnessFunction(Fitness):
+    def fitness(self, individual):
+        return float(get_rng().normal())
+
+    def fitness_batch(self, genomes):
+        return get_rng().normal(size=genomes.shape[0])
+
+    def value(self, individual, x):
+        pass
+
+
+def test_process_pool_evaluator_seeding():
+    genomes = np.zeros((8, 2))
+
+    def evaluate(seed):
+        with ProcessPoolEvaluator(max_workers=1) as evaluator:
+            evaluator.seed(np.random.SeedSequence(seed))
+            return evaluator.evaluate(NoisyFitnessFunction(), genomes)
+
+    assert np.array_equal(evaluate(5), evaluate(5))
+    assert not np.array_equal(evaluate(5), evaluate(6))
@@ -0,0 +1,68 @@
+import pickle
+
+import numpy as np
+
+from auxein.fitness import Fitness, CachedFitness
+from auxein.population import build_individual
+
+
+class CountingFitnessFunction(Fitness):
+    def __init__(self):
+        self.evaluations = 0
+
+    def fitness(self, individual):
+        self.evaluations += 1
+        return float(np.sum(individual.genotype.dna))
+
+    def fitness_batch(self, genomes):
+        self.evaluations += len(genomes)
+        return np.sum(genomes, axis=1)
+
+    def value(self, individual, x):
+        pass
+
+
+def test_cached_fitness_hits_and_misses():
+    fitness_function = CountingFitnessFunction()
+    cached = CachedFitness(fitness_function)
+
+    assert cached.fitness(build_individual([1.0, 2.0])) == 3.0
+    assert cached.fitness(build_individual([1.0, 2.0])) == 3.0
+    assert fitness_function.evaluations == 1
+
+    genomes = np.array([[1.0, 2.0], [3.0, 4.0], [3.0, 4.0], [0.0, 1.0]])
+    assert np.array_equal(cached.fitness_batch(genomes), [3.0, 7.0, 7.0, 1.0])
+    assert fitness_function.evaluations == 3
+
+    info = cached.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (3, 3, 3)
+
+
+def test_cached_fitness_keys_include_shape():
+    cached = CachedFitness(CountingFitnessFunction())
+    cached.fitness(build_individual([1.0, 2.0]))
+    assert CachedFitness.key(np.array([1.0, 2.0])) != CachedFitness.key(np.array([[1.0, 2.0]]))
+    assert CachedFitness.key(np.array([1, 2])) == CachedFitness.key(np.array([1.0, 2.0]))
+
+
+def test_cached_fitness_lru_eviction():
+    fitness_function = CountingFitnessFunction()
+    cached = CachedFitness(fitness_function, maxsize=2)
+    cached.fitness_batch(np.array([[1.0], [2.0]]))
+    cached.fitness_batch(np.array([[1.0], [3.0]]))
+    assert cached.cache_info().currsize == 2
+    cached.fitness_batch(np.array([[1.0]]))
+    assert fitness_function.evaluations == 3
+    cached.fitness_batch(np.array([[2.0]]))
+    assert fitness_function.evaluations == 4
+
+    cached.cache_clear()
+    assert cached.cache_info() == (0, 0, 2, 0)
+
+
+def test_cached_fitness_is_picklable():
+    cached = CachedFitness(CountingFitnessFunction())
+    cached.fitness_batch(np.array([[1.0]]))
+    restored = pickle.loads(pickle.dumps(cached))
+    assert restored.fitness_batch(np.array([[1.0]]))[0] == 1.0
+    assert restored.cache_info().hits == 1
@@ -1,3 +1,4 @@
+import numpy as np
 
 from auxein.population import build_individual
 from auxein.fitness.kernel_based import GlobalMinimum
@@ -12,3 +13,13 @@ def test_global_minimum_fitness_value_and_fitness():
     individual = build_individual([10])
     fitness = GlobalMinimum(kernel)
     assert fitness.value(0, 10) == fitness.fitness(individual)
+
+
+def test_global_minimum_fitness_batch():
+    def kernel(x):
+        return np.sum(x**2, axis=-1)
+
+    genomes = np.array([[1.0, 2.0], [0.0, 3.0]])
+    expected = [GlobalMinimum(kernel).fitness(build_individual(dna)) for dna in genomes]
+    assert np.array_equal(GlobalMinimum(kernel).fitness_batch(genomes), expected)
+    assert np.array_equal(GlobalMinimum(kernel, vectorized=True).fitness_batch(genomes), expected)
@@ -1,7 +1,8 @@
 import numpy as np
 
 from auxein.population import build_individual
-from auxein.fitness.observation_based import ObservationBasedFitness, MultipleLinearRegression, MaximumLikelihood
+from auxein.fitness.utils import logit
+from auxein.fitness.observation_based import ObservationBasedFitness, MultipleLinearRegression, PolynomialRegression, SimplePolynomialRegression, MaximumLikelihood
 
 
 def test_multiple_linear_regression():
@@ -45,3 +46,121 @@ def test_maximum_likelihood_value():
     assert np.isclose(fitness_function.value(i, [3]), 0.61, atol=0.01)
     assert np.isclose(fitness_function.value(i, [4]), 0.87, atol=0.01)
     assert np.isclose(fitness_function.value(i, [5]), 0.97, atol=0.01)
+
+
+def test_fitness_batch_matches_fitness():
+    xs = np.random.uniform(-1, 1, (20, 2))
+    y = np.random.uniform(-1, 1, 20)
+    y_binary = np.tile([0, 1], 10)
+    genomes = np.random.uniform(-1, 1, (5, 3))
+    fitness_functions = [
+        MultipleLinearRegression(xs, y),
+        SimplePolynomialRegression(xs[:, :1], y),
+        MaximumLikelihood(xs, y_binary)
+    ]
+    for fitness_function in fitness_functions:
+        expected = [fitness_function.fitness(build_individual(dna)) for dna in genomes]
+        assert np.allclose(fitness_function.fitness_batch(genomes), expected)
+
+
+def test_default_fitness_batch():
+    class TestFitnessFunction(ObservationBasedFitness):
+        def fitness(self, individual):
+            return individual.genotype.dna[0] + individual.genotype.dna[1]
+
+        def value(self, individual, x):
+            pass
+
+    genomes = np.array([[1.0, 2.0], [-1.0, 0.5]])
+    assert np.array_equal(TestFitnessFunction().fitness_batch(genomes), [3.0, -0.5])
+
+
+def test_multiple_linear_regression_with_sufficient_statistics():
+    xs = np.array([[23], [26], [30], [34], [43], [48], [52], [57], [58]])
+    y = np.array([651, 762, 856, 1063, 1190, 1298, 1421, 1440, 1518])
+
+    i = build_individual([23.42, 167.68], [])
+    fitness_function = MultipleLinearRegression(xs, y, sufficient_statistics=True)
+    assert np.isclose(fitness_function.fitness(i), -18804)
+
+    genomes = np.random.uniform(-10, 10, (5, 2))
+    expected = MultipleLinearRegression(xs, y).fitness_batch(genomes)
+    assert np.allclose(fitness_function.fitness_batch(genomes), expected)
+
+
+def test_maximum_likelihood_fitness():
+    xs = np.array([[0.50], [0.75], [1.00], [1.25], [1.50], [1.75], [1.75], [2.00], [2.25], [2.50], [2.75], [3.00], [3.25], [3.50], [4.00], [4.25], [4.50], [4.75], [5.00], [5.50]])
+    y = np.array([0, 0, 1, 0, 0, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 1, 1, 1, 1, 1])
+    i = build_individual([-4.0777, 1.5046])
+
+    expected = sum(logit(-4.0777, [1.5046], x) if yi == 1 else 1 - logit(-4.0777, [1.5046], x) for (x, yi) in zip(xs, y))
+    assert np.isclose(MaximumLikelihood(xs, y).fitness(i), expected)
+
+    expected = sum(np.log(logit(-4.0777, [1.5046], x)) if yi == 1 else np.log(1 - logit(-4.0777, [1.5046], x)) for (x, yi) in zip(xs, y))
+    assert np.isclose(MaximumLikelihood(xs, y, log_likelihood=True).fitness(i), expected)
+
+
+def test_maximum_likelihood_does_not_overflow():
+    xs = np.array([[-1.0], [1.0]])
+    y = np.array([0, 1])
+    fitness_function = MaximumLikelihood(xs, y, log_likelihood=True)
+    with np.errstate(over='raise'):
+        values = fitness_function.fitness_batch(np.array([[0.0, 1e4], [0.0, -1e4]]))
+    assert np.isclose(values[0], 0.0)
+    assert np.isclose(values[1], -2e4)
+
+
+def test_polynomial_regression_with_uneven_genomes():
+    xs = np.random.uniform(-2, 2, (30, 1))
+    y = np.polyval([0.5, -2.5, 1, 2], xs[:, 0])
+    fitness_function = SimplePolynomialRegression(xs, y)
+
+    assert np.isclose(fitness_function.fitness(build_individual([0.5, -2.5, 1, 2])), 0)
+    for dna in ([1.0, 2.0], [0.1, 0.5, -2.5, 1, 2]):
+        expected = -1 * np.sum((np.polyval(dna, xs[:, 0]) - y)**2)
+        assert np.isclose(fitness_function.fitness(build_individual(dna)), expected)
+        assert np.isclose(fitness_function.fitness_batch(np.array([dna]))[0], expected)
+
+
+def test_multivariate_polynomial_regression():
+    xs = np.random.uniform(-2, 2, (30, 2))
+    # 0.5 * x1^2 + 1.5 * x1 * x2 - x2^2 + 2 * x1 + 3
+    y = 0.5 * xs[:, 0]**2 + 1.5 * xs[:, 0] * xs[:, 1] - xs[:, 1]**2 + 2 * xs[:, 0] + 3
+    fitness_function = PolynomialRegression(xs, y)
+
+    i = build_individual([-1.0, 1.5, 0.5, 0.0, 2.0, 3.0])
+    assert np.isclose(fitness_function.fitness(i), 0)
+    assert np.isclose(fitness_function.value(i, [1.0, 2.0]), 4.5)
+
+
+def test_fitness_landscape_n_dimensional_with_chunks():
+    class TestFitnessFunction(ObservationBasedFitness):
+        def fitness(self, individual):
+            return np.sum(individual.genotype.dna)
+
+        def fitness_batch(self, genomes):
+            return np.sum(genomes, axis=1)
+
+        def value(self, individual, x):
+            pass
+
+    fitness_function = TestFitnessFunction()
+    landscape = fitness_function.get_landscape([[-1, 1], [0, 1], [2, 3]], 4)
+    assert landscape.shape == (64, 4)
+    assert np.allclose(landscape[:, 3], np.sum(landscape[:, :3], axis=1))
+    assert np.array_equal(landscape[:4, 0], np.linspace(-1, 1, 4))
+    assert np.array_equal(fitness_function.get_landscape([[-1, 1], [0, 1], [2, 3]], 4, chunk_size=5), landscape)
+
+
+def test_fitness_landscape_slice():
+    class TestFitnessFunction(ObservationBasedFitness):
+        def fitness(self, individual):
+            return individual.genotype.dna[0] * individual.genotype.dna[1] + individual.genotype.dna[2]
+
+        def value(self, individual, x):
+            pass
+
+    landscape = TestFitnessFunction().get_landscape_slice([[-1, 1], [0, 1]], 3, [10.0, 20.0, 5.0], dimensions=(2, 0))
+    # columns are [x2, x0, f] with f = 20 * x0 + x2
+    expected = [[-1, 0, -1], [0, 0, 0], [1, 0, 1], [-1, 0.5, 9], [0, 0.5, 10], [1, 0.5, 11], [-1, 1, 19], [0, 1, 20], [1, 1, 21]]
+    assert np.allclose(landscape, expected)
@@ -1,6 +1,8 @@
 import numpy as np
 
-from auxein.fitness.utils import linear_fit, polynomial_fit, residual, least_squares, logit
+from auxein.fitness.utils import linear_fit, polynomial_fit, residual, least_squares, linear_residuals, linear_least_squares, logit
+from auxein.fitness.utils import linear_sufficient_statistics, sufficient_statistics_least_squares
+from auxein.fitness.utils import polynomial_features, PolynomialDesignMatrix
 
 
 def test_linear_fit_2d():
@@ -76,3 +78,60 @@ def test_logit_3d():
     # ~ 0.48750
     value = logit(alpha, coeff, x)
     assert np.isclose(value, 0.48750, atol=0.00001)
+
+
+def test_linear_residuals():
+    xs = np.array([[1.0, 0.0], [0.0, 1.0]])
+    y = np.array([10, 20])
+
+    assert np.array_equal(linear_residuals(xs, y, np.array([0.0, 1.0, 0.0])), [-10.0, -19.0])
+    assert np.array_equal(
+        linear_residuals(xs, y, np.array([[0.0, 1.0, 0.0], [1.0, 0.0, 0.0]])),
+        [[-10.0, -9.0], [-19.0, -20.0]]
+    )
+
+
+def test_linear_least_squares_matches_reference():
+    xs = np.random.uniform(-10, 10, (50, 3))
+    y = np.random.uniform(-10, 10, 50)
+    coeffs = np.random.uniform(-1, 1, (4, 4))
+
+    expected = [least_squares(xs, y, coeff) for coeff in coeffs]
+    assert np.isclose(linear_least_squares(xs, y, coeffs[0]), expected[0])
+    assert np.allclose(linear_least_squares(xs, y, coeffs), expected)
+    assert np.allclose(linear_least_squares(xs, y, coeffs, chunk_size=7), expected)
+
+
+def test_sufficient_statistics_least_squares_matches_reference():
+    xs = np.random.uniform(-10, 10, (50, 3))
+    y = np.random.uniform(-10, 10, 50)
+    coeffs = np.random.uniform(-1, 1, (4, 4))
+    (gram, moment, yy) = linear_sufficient_statistics(xs, y)
+
+    expected = [least_squares(xs, y, coeff) for coeff in coeffs]
+    assert np.isclose(sufficient_statistics_least_squares(gram, moment, yy, coeffs[0]), expected[0])
+    assert np.allclose(sufficient_statistics_least_squares(gram, moment, yy, coeffs), expected)
+
+
+def test_polynomial_features_match_polyval():
+    xs = np.random.uniform(-2, 2, (10, 1))
+    coeff = np.array([0.5, -2.5, 1, 2])
+    assert np.allclose(polynomial_features(xs, 4) @ coeff, np.polyval(coeff, xs[:, 0]))
+
+
+def test_polynomial_features_include_interactions():
+    xs = np.random.uniform(-2, 2, (10, 3))
+    (x1, x2, x3) = xs.T
+    degree_3 = [x1**3, x1**2 * x2, x1**2 * x3, x1 * x2**2, x1 * x2 * x3, x1 * x3**2, x2**3, x2**2 * x3, x2 * x3**2, x3**3]
+    expected = np.column_stack([np.ones(10), x1, x2, x3, x1**2, x1 * x2, x1 * x3, x2**2, x2 * x3, x3**2] + degree_3)
+    assert np.allclose(polynomial_features(xs, 20), expected[:, ::-1])
+
+
+def test_polynomial_design_matrix_reuses_columns():
+    xs = np.array([[2.0, 3.0], [-1.0, 0.5]])
+    design = PolynomialDesignMatrix(xs)
+    assert np.array_equal(design.get(3), [[3.0, 2.0, 1.0], [0.5, -1.0, 1.0]])
+    assert np.array_equal(design.get(5), [[6.0, 4.0, 3.0, 2.0, 1.0], [-0.5, 1.0, 0.5, -1.0, 1.0]])
+    size = design.size
+    assert np.array_equal(design.get(2), polynomial_features(xs, 2))
+    assert design.size == size
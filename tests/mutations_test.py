@@ -1,7 +1,7 @@
 import numpy as np
 
 from auxein import Genotype
-from auxein.mutations import Uniform, FixedVariance, SelfAdaptiveSingleStep
+from auxein.mutations import Uniform, FixedVariance, SelfAdaptiveSingleStep, SelfAdaptiveNStep
 
 
 def test_uniform_mutate_one_gene():
@@ -29,3 +29,52 @@ def test_uncorrelated_with_single_step_variance():
     assert np.count_nonzero(genotype.dna == mutated_genotype.dna) == 0
     assert np.unique(mutated_genotype.mask).size == 1
     assert np.unique(mutated_genotype.dna).size != 1
+
+
+def test_uniform_mutate_batch():
+    dna = np.zeros((10, 5))
+    mask = np.zeros((10, 5))
+    (mutated_dna, mutated_mask) = Uniform(10000, 20000).mutate_batch(dna, mask, np.random.default_rng(0))
+    assert mutated_dna.shape == (10, 5)
+    assert np.all(np.count_nonzero(mutated_dna, axis=1) == 1)
+    assert np.array_equal(mutated_mask, mask)
+    assert np.count_nonzero(dna) == 0
+
+
+def test_fixed_variance_mutate_batch_with_mutation_probability():
+    dna = np.zeros((1000, 5))
+    mutation_function = FixedVariance(1000, mutation_probability=0.2)
+    (mutated_dna, _) = mutation_function.mutate_batch(dna, np.zeros((1000, 0)), np.random.default_rng(0))
+    assert np.isclose(np.count_nonzero(mutated_dna) / mutated_dna.size, 0.2, atol=0.02)
+
+
+def test_self_adaptive_single_step_mutate_batch():
+    dna = np.zeros((10, 5))
+    mask = np.ones((10, 5))
+    (mutated_dna, mutated_mask) = SelfAdaptiveSingleStep(0.05).mutate_batch(dna, mask, np.random.default_rng(0))
+    assert np.all(np.ptp(mutated_mask, axis=1) == 0)
+    assert np.unique(mutated_mask[:, 0]).size == 10
+    assert np.count_nonzero(mutated_dna) == 50
+
+
+def test_self_adaptive_n_step():
+    genotype = Genotype(np.zeros(5), np.ones(5))
+    mutated_genotype = SelfAdaptiveNStep(epsilon=0.01).mutate(genotype, np.random.default_rng(0))
+    assert genotype.dimension == mutated_genotype.dimension
+    assert np.unique(mutated_genotype.mask).size == 5
+    assert np.all(mutated_genotype.mask >= 0.01)
+    assert np.count_nonzero(mutated_genotype.dna) == 5
+
+
+def test_self_adaptive_n_step_with_negative_mask():
+    genotype = Genotype(np.zeros(5), np.full(5, -0.7))
+    mutated_genotype = SelfAdaptiveNStep().mutate(genotype, np.random.default_rng(0))
+    assert np.all(mutated_genotype.mask > 0)
+    assert np.count_nonzero(mutated_genotype.dna) == 5
+
+
+def test_mutate_with_extension():
+    genotype = Genotype(np.zeros(5), np.ones(5))
+    mutated_genotype = FixedVariance(1, extend_probability=1).mutate(genotype)
+    assert mutated_genotype.dimension == 6
+    assert len(mutated_genotype.mask) == 6
@@ -0,0 +1,178 @@
+import asyncio
+from functools import partial
+
+import numpy as np
+import pytest
+
+from auxein.evaluators import ProcessPoolEvaluator
+from auxein.fitness import Fitness, GlobalMinimum
+from auxein.mutations import SelfAdaptiveSingleStep
+from auxein.parents.distributions import SigmaScaling
+from auxein.parents.selections import StochasticUniversalSampling
+from auxein.playgrounds import Static, Islands, SteadyState
+from auxein.population import build_fixed_dimension_population
+from auxein.population.dna_builders import UniformRandomDnaBuilder
+from auxein.recombinations import SimpleArithmetic, MatrixRecombination
+from auxein.replacements import ReplaceWorst, ElitistReplacement, CommaReplacement
+
+
+def train_static(seed, **kwargs):
+    fitness = GlobalMinimum(lambda x: float(np.sum(x**2)))
+    population = build_fixed_dimension_population(2, 20, fitness, UniformRandomDnaBuilder((-5, 5)), rng=np.random.default_rng(seed))
+    playground = Static(
+        population, fitness, SelfAdaptiveSingleStep(0.05), SigmaScaling(), StochasticUniversalSampling(6),
+        SimpleArithmetic(0.5), ReplaceWorst(5), seed=seed, **kwargs
+    )
+    playground.train(10)
+    return np.sort(population.fitness_values())
+
+
+def test_static_is_reproducible_with_a_seed():
+    for kwargs in ({}, {'pipeline': True, 'lazy_offspring': True}):
+        assert np.array_equal(train_static(3, **kwargs), train_static(3, **kwargs))
+        assert not np.array_equal(train_static(3, **kwargs), train_static(4, **kwargs))
+
+
+class CountingSphere(GlobalMinimum):
+    def __init__(self):
+        super().__init__(lambda x: float(np.sum(x**2)))
+        self.evaluated = 0
+
+    def fitness_batch(self, genomes):
+        self.evaluated += len(genomes)
+        return super().fitness_batch(genomes)
+
+
+def test_static_re_evaluates_the_population_unless_stationary():
+    # the whole population is re-evaluated by default, only new individuals with a stationary fitness.
+    for (kwargs, full) in (({}, True), ({'stationary_fitness': True}, False)):
+        fitness = CountingSphere()
+        population = build_fixed_dimension_population(2, 20, fitness, UniformRandomDnaBuilder((-5, 5)), rng=np.random.default_rng(0))
+        fitness.evaluated = 0
+        Static(
+            population, fitness, SelfAdaptiveSingleStep(0.05), SigmaScaling(), StochasticUniversalSampling(6),
+            SimpleArithmetic(0.5), ReplaceWorst(5), seed=0, **kwargs
+        ).train(3)
+        assert (fitness.evaluated >= 3 * population.size()) is full
+
+
+def test_static_with_comma_replacement():
+    fitness = GlobalMinimum(lambda x: float(np.sum(x**2)))
+    # the selection alone yields 24 children, fewer than μ = 30.
+    for (replacement, kwargs) in ((CommaReplacement(1), {}), (CommaReplacement(40), {'pipeline': True, 'lazy_offspring': True})):
+        population = build_fixed_dimension_population(2, 30, fitness, UniformRandomDnaBuilder((-5, 5)), rng=np.random.default_rng(0))
+        initial_ids = set(population.ids().tolist())
+        playground = Static(
+            population, fitness, SelfAdaptiveSingleStep(0.05), SigmaScaling(), StochasticUniversalSampling(29),
+            SimpleArithmetic(0.5), replacement, seed=0, **kwargs
+        )
+        stats = playground.train(3)
+        assert len(stats['generations']) == 3
+        assert population.size() == 30
+        assert initial_ids.isdisjoint(population.ids().tolist())
+
+
+def test_static_with_matrix_recombination():
+    fitness = GlobalMinimum(lambda x: float(np.sum(x**2)))
+    for kwargs in ({}, {'pipeline': True}):
+        population = build_fixed_dimension_population(4, 20, fitness, UniformRandomDnaBuilder((-5, 5)), rng=np.random.default_rng(0))
+        playground = Static(
+            population, fitness, SelfAdaptiveSingleStep(0.05), SigmaScaling(), StochasticUniversalSampling(6),
+            MatrixRecombination((2, 2), SimpleArithmetic(0.5)), ReplaceWorst(5), seed=0, **kwargs
+        )
+        stats = playground.train(3)
+        assert len(stats['generations']) == 3
+        assert population.size() == 20
+        assert population.dna_matrix().shape == (20, 4)
+
+
+def sphere(x):
+    return float(np.sum(x**2))
+
+
+def island_factory(index, seed_sequence, evaluator_workers=None):
+    fitness = GlobalMinimum(sphere)
+    rng = np.random.default_rng(seed_sequence)
+    population = build_fixed_dimension_population(2, 20, fitness, UniformRandomDnaBuilder((-5, 5)), rng=rng)
+    return Static(
+        population, fitness, SelfAdaptiveSingleStep(0.05), SigmaScaling(), StochasticUniversalSampling(6),
+        SimpleArithmetic(0.5), ReplaceWorst(5), seed=seed_sequence, pipeline=True,
+        evaluator=ProcessPoolEvaluator(evaluator_workers) if evaluator_workers is not None else None
+    )
+
+
+def test_islands():
+    results = []
+    for (processes, topology) in ((False, 'ring'), (True, 'ring'), (False, 'random')):
+        islands = Islands(GlobalMinimum(sphere), island_factory, 3, 4, migrants=2, topology=topology, processes=processes, seed=9)
+        stats = islands.train(10)
+
+        assert stats['migrations'] == 2
+        assert len(stats['islands']) == 3
+        assert sorted(stats['islands'][0]['generations'].keys()) == list(range(10))
+        assert islands.population.size() == 60
+        assert [population.size() for population in islands.populations] == [20, 20, 20]
+        assert islands.get_most_performant().genotype.dimension == 2
+        results.append(np.sort(islands.population.fitness_values()))
+
+    # islands draw from the same streams whether they run in processes or not.
+    assert np.array_equal(results[0], results[1])
+
+
+def test_islands_with_process_pool_evaluators():
+    islands = Islands(GlobalMinimum(sphere), partial(island_factory, evaluator_workers=2), 2, 2, seed=9)
+    stats = islands.train(4)
+
+    assert stats['migrations'] == 1
+    assert islands.population.size() == 40
+
+
+class AsyncSphere(Fitness):
+    async def fitness(self, individual):
+        await asyncio.sleep(0.001 * (1 + int(individual.id) % 3))
+        return -sphere(individual.genotype.dna)
+
+    def value(self, individual, x):
+        return sphere(x)
+
+
+def test_steady_state():
+    configurations = ((GlobalMinimum(sphere), ReplaceWorst(1)), (AsyncSphere(), ElitistReplacement(1)), (AsyncSphere(), ReplaceWorst(30)))
+    for (fitness, replacement) in configurations:
+        population = build_fixed_dimension_population(2, 20, fitness, UniformRandomDnaBuilder((-5, 5)), rng=np.random.default_rng(1))
+        initial_best = population.max_fitness()
+        # unevaluated members are scored by the playground itself.
+        population.add_batch(np.full((2, 2), 5.0), np.ones((2, 2)))
+        playground = SteadyState(
+            population, fitness, SelfAdaptiveSingleStep(0.05), SigmaScaling(), StochasticUniversalSampling(6),
+            SimpleArithmetic(0.5), replacement, workers=4, seed=1
+        )
+        stats = playground.train(5)
+
+        assert population.generation_count == 5
+        assert population.size() == 22
+        assert population.dirty_count() == 0
+        assert stats['evaluations'] >= 110
+        assert sorted(stats['generations'].keys()) == [0, 1, 2, 3, 4]
+        assert population.max_fitness() >= initial_best
+
+
+def test_steady_state_rejects_comma_replacement():
+    fitness = GlobalMinimum(sphere)
+    population = build_fixed_dimension_population(2, 10, fitness, UniformRandomDnaBuilder((-5, 5)), rng=np.random.default_rng(1))
+    with pytest.raises(AssertionError, match='SteadyState'):
+        SteadyState(
+            population, fitness, SelfAdaptiveSingleStep(0.05), SigmaScaling(), StochasticUniversalSampling(6),
+            SimpleArithmetic(0.5), CommaReplacement(1)
+        )
+
+
+def test_async_fitness_batch():
+    fitness = AsyncSphere()
+    assert np.array_equal(fitness.fitness_batch(np.array([[1.0, 2.0], [0.0, 3.0]])), [-5.0, -9.0])
+
+    async def evaluate_in_loop():
+        fitness.fitness_batch(np.zeros((1, 2)))
+
+    with pytest.raises(RuntimeError, match='running event loop'):
+        asyncio.run(evaluate_in_loop())
@@ -4,8 +4,9 @@ import numpy as np
 
 from auxein.population.dna_builders import UniformRandomDnaBuilder
 from auxein.fitness import Fitness
-from auxein.population.individual import build_individual, Genotype
+from auxein.population.individual import build_individual, Genotype, as_id
 from auxein.population import build_fixed_dimension_population, build_variable_dimension_population, Population, Item
+from auxein.population.statistics import RunningStatistics, SortedIndex
 
 
 def test_build_population_dimension_and_size():
@@ -147,9 +148,9 @@ def test_rank_by_fitness_desc():
     population.add(build_individual([0.3, 0.2], [], '01f4eadc-e799-42d1-bc18-0fd85159bfb6'), 0.5)
     rank = population.rank_by_fitness()
 
-    assert rank[0] == ('01f4eadc-e799-42d1-bc18-0fd85159bfb6', 0.5)
-    assert rank[1] == ('e2ee1fd8-7bb9-4556-9435-cd012b0f5403', 0.4)
-    assert rank[2] == ('3adee626-de78-4f83-84f9-ebde4e8ee64d', 0.2)
+    assert rank[0] == (as_id('01f4eadc-e799-42d1-bc18-0fd85159bfb6'), 0.5)
+    assert rank[1] == (as_id('e2ee1fd8-7bb9-4556-9435-cd012b0f5403'), 0.4)
+    assert rank[2] == (as_id('3adee626-de78-4f83-84f9-ebde4e8ee64d'), 0.2)
 
 
 def test_rank_by_fitness_asc():
@@ -159,9 +160,9 @@ def test_rank_by_fitness_asc():
     population.add(build_individual([0.3, 0.2], [], '01f4eadc-e799-42d1-bc18-0fd85159bfb6'), 0.5)
     rank = population.rank_by_fitness(reverse=False)
 
-    assert rank[0] == Item('3adee626-de78-4f83-84f9-ebde4e8ee64d', 0.2)
-    assert rank[1] == Item('e2ee1fd8-7bb9-4556-9435-cd012b0f5403', 0.4)
-    assert rank[2] == Item('01f4eadc-e799-42d1-bc18-0fd85159bfb6', 0.5)
+    assert rank[0] == Item(as_id('3adee626-de78-4f83-84f9-ebde4e8ee64d'), 0.2)
+    assert rank[1] == Item(as_id('e2ee1fd8-7bb9-4556-9435-cd012b0f5403'), 0.4)
+    assert rank[2] == Item(as_id('01f4eadc-e799-42d1-bc18-0fd85159bfb6'), 0.5)
 
 
 dna = np.array([0.1, 0.5, 0.95])
@@ -179,3 +180,259 @@ def test_genotype_dna():
     assert genotype.dna[0] == 0.1
     assert genotype.dna[1] == 0.5
     assert genotype.dna[2] == 0.95
+
+
+def test_storage_grows_and_reuses_killed_slots():
+    population = Population(initial_capacity=2)
+    population.add(build_individual([0.1, 0.1], [], '3adee626-de78-4f83-84f9-ebde4e8ee64d'), 0.2)
+    population.add(build_individual([0.1, 0.3], [], 'e2ee1fd8-7bb9-4556-9435-cd012b0f5403'), 0.4)
+    population.add(build_individual([0.3, 0.2, 0.5], [], '01f4eadc-e799-42d1-bc18-0fd85159bfb6'), 0.5)
+    assert population.size() == 3
+    assert population.capacity == 4
+    assert population.get('01f4eadc-e799-42d1-bc18-0fd85159bfb6').individual.dimension() == 3
+
+    population.kill('e2ee1fd8-7bb9-4556-9435-cd012b0f5403')
+    population.add(build_individual([0.5, 0.5], [], '4f5db033-896a-4521-ab41-48b2177d7cd7'), 1.0)
+    assert population.size() == 3
+    assert population.capacity == 4
+    assert np.array_equal(population.get('4f5db033-896a-4521-ab41-48b2177d7cd7').individual.genotype.dna, [0.5, 0.5])
+    assert np.array_equal(population.get('3adee626-de78-4f83-84f9-ebde4e8ee64d').individual.genotype.dna, [0.1, 0.1])
+
+
+def test_get_full_genome_is_a_matrix():
+    population = init_population(4, 10)
+    genome = population.get_full_genome()
+    assert genome.shape == (10, 4)
+    for (row, item) in zip(genome, population.pool):
+        assert np.array_equal(row, item.individual.genotype.dna)
+
+
+def test_incremental_update():
+    class TestFitnessFunction(Fitness):
+        def __init__(self):
+            self.evaluated = 0
+
+        def fitness(self, individual):
+            return individual.genotype.dna[0] + individual.genotype.dna[1]
+
+        def fitness_batch(self, genomes):
+            self.evaluated += len(genomes)
+            return np.sum(genomes, axis=1)
+
+        def value(self, individual, x):
+            pass
+
+    population = build_fully_specified_population()
+    population.add(build_individual([0.5, 0.5], [], '4f5db033-896a-4521-ab41-48b2177d7cd7'))
+    assert population.dirty_count() == 1
+    assert population.is_dirty('4f5db033-896a-4521-ab41-48b2177d7cd7')
+    assert np.isnan(population.get('4f5db033-896a-4521-ab41-48b2177d7cd7').fitness)
+
+    fitness_function = TestFitnessFunction()
+    population.update(fitness_function, incremental=True)
+    assert fitness_function.evaluated == 1
+    assert population.dirty_count() == 0
+    assert population.generation_count == 1
+    assert population.get('4f5db033-896a-4521-ab41-48b2177d7cd7').fitness == 1.0
+    assert population.get('3adee626-de78-4f83-84f9-ebde4e8ee64d').fitness == 1.0
+
+    population.mark_dirty('01f4eadc-e799-42d1-bc18-0fd85159bfb6')
+    population.update(fitness_function, incremental=True)
+    assert fitness_function.evaluated == 2
+    assert np.isclose(population.get('01f4eadc-e799-42d1-bc18-0fd85159bfb6').fitness, 0.2)
+
+    population.update(fitness_function)
+    assert fitness_function.evaluated == 6
+    assert np.isclose(population.get('3adee626-de78-4f83-84f9-ebde4e8ee64d').fitness, 1.0)
+
+
+def test_running_statistics_match_numpy():
+    values = np.random.uniform(-10, 10, 50)
+    statistics = RunningStatistics(lambda: remaining)
+    for v in values[:30]:
+        statistics.push(v)
+    statistics.push_many(values[30:])
+    for v in values[:5]:
+        statistics.remove(v)
+    statistics.remove_many(values[40:])
+    remaining = values[5:40]
+
+    assert statistics.count == 35
+    assert np.isclose(statistics.total, np.sum(remaining))
+    assert np.isclose(statistics.mean, np.mean(remaining))
+    assert np.isclose(statistics.std, np.std(remaining))
+    assert statistics.min == np.min(remaining)
+    assert statistics.max == np.max(remaining)
+
+
+def test_get_stats_after_kill_and_update():
+    population = init_population(2, 20)
+
+    class TestFitnessFunction(Fitness):
+        def fitness(self, individual):
+            return individual.genotype.dna[0] + individual.genotype.dna[1]
+
+        def value(self, individual, x):
+            pass
+
+    population.update(TestFitnessFunction())
+    for (individual_id, _) in population.rank_by_fitness(3):
+        population.kill(individual_id)
+    population.add(build_individual([5.0, 5.0], []), 10.0)
+
+    fitness = np.array([item.fitness for item in population.pool])
+    stats = population.get_stats()
+    assert stats['size'] == 18
+    assert np.isclose(stats['mean_fitness'], np.mean(fitness))
+    assert np.isclose(stats['std_fitness'], np.std(fitness))
+    assert stats['min_fitness'] == np.min(fitness)
+    assert stats['max_fitness'] == 10.0
+    assert np.isclose(population.total_fitness(), np.sum(fitness))
+    assert stats['min_age'] <= stats['mean_age'] <= stats['max_age']
+
+
+def test_add_batch_and_kill_batch():
+    population = Population(initial_capacity=2)
+    population.add(build_individual([0.0, 0.0], [1.0]), 0.5)
+    dna = np.arange(8.0).reshape(4, 2)
+    mask = np.ones((4, 1))
+    ids = population.add_batch(dna, mask, np.array([1.0, 2.0, 3.0, 4.0]))
+
+    assert population.size() == 5
+    assert population.has_uniform_dimensions() is True
+    assert np.array_equal(population.get(ids[2]).individual.genotype.dna, [4.0, 5.0])
+    assert np.array_equal(population.dna_matrix()[1:], dna)
+    assert population.mask_matrix().shape == (5, 1)
+    assert population.max_fitness() == 4.0
+
+    population.kill_batch([ids[3], ids[1], -1])
+    assert population.size() == 3
+    assert population.max_fitness() == 3.0
+    assert population.mean_fitness() == pytest.approx(1.5)
+
+    unevaluated = population.add_batch(dna[:2], mask[:2])
+    assert population.dirty_count() == 2
+    assert all(population.is_dirty(i) for i in unevaluated)
+
+
+def test_add_with_nan_fitness_is_dirty():
+    population = Population()
+    population.add(build_individual([1.0], []), 2.0)
+    unevaluated = build_individual([3.0], [])
+    population.add(unevaluated, np.nan)
+
+    assert population.is_dirty(unevaluated.id) is True
+    assert population.dirty_count() == 1
+    assert population.mean_fitness() == 2.0
+    assert population.std_fitness() == 0.0
+
+    population.kill(unevaluated.id)
+    assert population.mean_fitness() == 2.0
+
+
+def test_genotype_is_immutable_and_zero_copy():
+    dna = np.array([0.1, 0.5])
+    genotype = Genotype(dna, np.array([1.0]))
+    dna[0] = 0.7
+    assert genotype.dna[0] == 0.1
+    assert genotype.dna is genotype.dna
+    with pytest.raises(ValueError):
+        genotype.dna[0] = 0.3
+    with pytest.raises(ValueError):
+        genotype.mask[0] = 0.3
+
+    # read-only arrays are shared rather than copied.
+    assert Genotype(genotype.dna, genotype.mask).dna is genotype.dna
+
+    from_lists = Genotype([1.0, 2.0], [0.5, 0.5])
+    assert isinstance(from_lists.dna, np.ndarray) and isinstance(from_lists.mask, np.ndarray)
+    assert not from_lists.dna.flags.writeable and not from_lists.mask.flags.writeable
+
+    population = Population()
+    individual = build_individual([0.1, 0.5], [1.0])
+    population.add(individual, 1.0)
+    population.add_batch(np.zeros((1, 2)), np.zeros((1, 1)))
+    stored = population.get(individual.id).individual.genotype
+    population.kill(individual.id)
+    population.add(build_individual([0.9, 0.9], [0.0]), 2.0)
+    assert np.array_equal(stored.dna, [0.1, 0.5])
+
+
+def test_individual_ids_and_birth_generation():
+    first = build_individual([0.1], [])
+    second = build_individual([0.2], [])
+    assert isinstance(first.id, int)
+    assert second.id > first.id
+    assert as_id(first.uuid) == first.id
+    assert as_id(str(first.id)) == first.id
+    with pytest.raises(ValueError, match='not an individual id'):
+        as_id('first')
+    assert not hasattr(first, '__dict__')
+
+    class TestFitnessFunction(Fitness):
+        def fitness(self, individual):
+            return 1.0
+
+        def value(self, individual, x):
+            pass
+
+    population = Population()
+    population.add(first, 1.0)
+    population.update(TestFitnessFunction())
+    population.update(TestFitnessFunction())
+    population.add(second, 1.0)
+    population.add_batch(np.zeros((2, 1)), np.zeros((2, 0)), np.ones(2))
+    assert population.get(first.uuid).individual.birth_generation == 0
+    assert population.get(str(second.id)).individual == second
+    assert population.get(second.id).individual.age(population.generation_count) == 0
+    assert population.max_age() == 2
+    assert population.min_age() == 0
+    assert population.mean_age() == pytest.approx(0.5)
+
+
+def test_sorted_index():
+    index = SortedIndex()
+    index.reset(np.array([0.5, 0.1, 0.3]), np.array([0, 1, 2]))
+    index.insert(0.2, 3)
+    index.insert_many(np.array([0.4, 0.0]), np.array([4, 5]))
+    assert np.array_equal(index.keys, [5, 1, 3, 2, 4, 0])
+    index.remove(0.3, 2)
+    index.remove_many(np.array([5, 0]))
+    assert np.array_equal(index.values, [0.1, 0.2, 0.4])
+    assert np.array_equal(index.largest(2)[1], [4, 3])
+    assert np.array_equal(index.smallest(5)[1], [1, 3, 4])
+    assert (index.min, index.max) == (0.1, 0.4)
+
+
+def test_fitness_index_matches_full_sort():
+    class TestFitnessFunction(Fitness):
+        def fitness(self, individual):
+            return float(np.sum(individual.genotype.dna))
+
+        def value(self, individual, x):
+            pass
+
+    rng = np.random.default_rng(7)
+    population = Population(initial_capacity=4)
+    for _ in range(20):
+        population.add(build_individual(rng.normal(size=2), []), float(rng.normal()))
+    for step in range(30):
+        ids = population.ids()
+        population.kill_batch(ids[rng.choice(ids.size, 3, replace=False)])
+        population.kill(population.ids()[0])
+        population.add_batch(rng.normal(size=(3, 2)), np.zeros((3, 0)), rng.normal(size=3))
+        population.add(build_individual(rng.normal(size=2), []), float(rng.normal()))
+        population.add(build_individual(rng.normal(size=2), []))
+        if step % 5 == 0:
+            population.update(TestFitnessFunction(), incremental=step % 10 == 0)
+
+        fitness = population.fitness_values()
+        evaluated = np.sort(fitness[~np.isnan(fitness)])
+        worst = [f for (_, f) in population.rank_by_fitness(5, reverse=False)]
+        best = [f for (_, f) in population.rank_by_fitness(5)]
+        assert np.array_equal(worst, evaluated[:5])
+        assert np.array_equal(best, evaluated[::-1][:5])
+        assert population.min_fitness() == evaluated[0]
+        assert population.max_fitness() == evaluated[-1]
+        assert len(population.rank_by_fitness()) == population.size()
+        assert dict(population.rank_by_fitness()) == pytest.approx(dict(zip(population.ids().tolist(), fitness)), nan_ok=True)
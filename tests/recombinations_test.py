@@ -5,6 +5,7 @@ from typing import Tuple
 import numpy as np
 
 from auxein.recombinations import Recombination, SimpleArithmetic, MatrixRecombination
+from auxein.recombinations import WholeArithmetic, UniformCrossover, NPointCrossover, OnePointCrossover, BlendCrossover
 
 
 def test_simple_arithmetic_with_full_blending():
@@ -65,3 +66,72 @@ def test_matrix_recombination():
     (child1_dna, child2_dna) = recombination.recombine(dna1, dna2)
     assert np.array_equal(child1_dna, dna1)
     assert np.array_equal(child2_dna, dna2)
+
+
+def test_simple_arithmetic_recombine_batch():
+    parents_a = np.tile(np.arange(1.0, 6.0), (20, 1))
+    parents_b = np.zeros((20, 5))
+    (children_a, children_b) = SimpleArithmetic(1).recombine_batch(parents_a, parents_b, np.random.default_rng(0))
+    assert np.array_equal(children_a + children_b, parents_a)
+    # with full blending each child keeps a prefix of its parent and takes the rest from the other one.
+    assert np.array_equal(children_a == 0, np.cumsum(children_a == 0, axis=1) > 0)
+    assert np.unique(np.count_nonzero(children_a, axis=1)).size > 1
+
+
+def test_whole_arithmetic():
+    (child1_dna, child2_dna) = WholeArithmetic(0.25).recombine(np.array([4.0, 8.0]), np.array([0.0, 0.0]))
+    assert np.array_equal(child1_dna, [3.0, 6.0])
+    assert np.array_equal(child2_dna, [1.0, 2.0])
+
+
+def test_uniform_crossover_batch():
+    parents_a = np.ones((50, 10))
+    parents_b = np.zeros((50, 10))
+    (children_a, children_b) = UniformCrossover().recombine_batch(parents_a, parents_b, np.random.default_rng(0))
+    assert np.array_equal(children_a + children_b, parents_a)
+    assert np.isclose(np.mean(children_a), 0.5, atol=0.1)
+
+
+def test_n_point_crossover_batch():
+    parents_a = np.ones((50, 10))
+    parents_b = np.zeros((50, 10))
+    (children_a, children_b) = NPointCrossover(3).recombine_batch(parents_a, parents_b, np.random.default_rng(0))
+    assert np.array_equal(children_a + children_b, parents_a)
+    assert np.all(children_a[:, 0] == 1)
+    assert np.all(np.count_nonzero(np.diff(children_a, axis=1), axis=1) == 3)
+
+    (child1_dna, child2_dna) = OnePointCrossover().recombine(np.ones(2), np.zeros(2))
+    assert np.array_equal(child1_dna, [1, 0])
+    assert np.array_equal(child2_dna, [0, 1])
+
+
+def test_blend_crossover_batch():
+    parents_a = np.random.uniform(-1, 1, (50, 4))
+    parents_b = np.random.uniform(-1, 1, (50, 4))
+    (children_a, children_b) = BlendCrossover(0.5).recombine_batch(parents_a, parents_b)
+    width = np.abs(parents_a - parents_b)
+    for children in (children_a, children_b):
+        assert np.all(children >= np.minimum(parents_a, parents_b) - 0.5 * width)
+        assert np.all(children <= np.maximum(parents_a, parents_b) + 0.5 * width)
+
+
+def test_matrix_recombination_batch():
+    parents_a = np.arange(12.0).reshape(2, 3, 2)
+    parents_b = np.zeros((2, 3, 2))
+    recombination = MatrixRecombination((3, 2), WholeArithmetic(0.5))
+    (children_a, children_b) = recombination.recombine_batch(parents_a, parents_b)
+    assert children_a.shape == (2, 3, 2)
+    assert np.array_equal(children_a, parents_a / 2)
+    assert np.array_equal(children_b, parents_a / 2)
+
+
+def test_default_recombine_batch():
+    class Identity(Recombination):
+        def recombine(self, parent1_dna: np.ndarray, parent2_dna: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            return (parent1_dna, parent2_dna)
+
+    parents_a = np.ones((3, 2))
+    parents_b = np.zeros((3, 2))
+    (children_a, children_b) = Identity().recombine_batch(parents_a, parents_b)
+    assert np.array_equal(children_a, parents_a)
+    assert np.array_equal(children_b, parents_b)
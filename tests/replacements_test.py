@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import numpy as np
+import pytest
+
 from auxein.fitness import Fitness
 from auxein.population import build_individual, Population
-from auxein.replacements import ReplaceWorst
+from auxein.replacements import Replacement, ReplaceWorst, ElitistReplacement, CommaReplacement, AgeBasedReplacement, RoundRobinTournamentReplacement
 
 
 def build_fully_specified_population():
@@ -34,3 +37,114 @@ def test_replace_worst():
     assert population.get('3adee626-de78-4f83-84f9-ebde4e8ee64d') is not None
     assert population.get('7fdbb922-6435-4ab1-87ec-3acccbf71da6') is not None
     assert population.get('45ae2513-4a81-4385-ad45-4c6d2e172c92') is not None
+
+
+def test_replace_worst_batch():
+    population = build_fully_specified_population()
+    dna = np.array([[0.1, 0.4], [0.1, 0.3]])
+    mask = np.empty((2, 0))
+
+    class TestFitnessFunction(Fitness):
+        def fitness(self, individual):
+            return individual.genotype.dna[0] + individual.genotype.dna[1]
+
+        def value(self, individual, x):
+            pass
+
+    replacement = ReplaceWorst(2)
+    replacement.replace_batch(dna, mask, population, TestFitnessFunction())
+
+    assert population.size() == 3
+    assert population.get('3adee626-de78-4f83-84f9-ebde4e8ee64d') is not None
+    assert sorted(population.fitness_values().tolist()) == pytest.approx([0.4, 0.5, 1.0])
+
+
+def test_replace_worst_offspring_demand():
+    population = build_fully_specified_population()
+    assert ReplaceWorst(2).offspring_demand(population, 10) == 2
+    assert ReplaceWorst(2).offspring_demand(population, 1) == 1
+    assert ReplaceWorst(5).offspring_demand(population, 10) == 3
+    assert ReplaceWorst(5).offspring_demand(population, 1) == 1
+
+
+def test_replace_worst_replace_evaluated_with_fewer_children():
+    population = build_fully_specified_population()
+    ReplaceWorst(5).replace_evaluated(np.array([[0.9, 0.9]]), np.empty((1, 0)), np.array([1.8]), population)
+
+    assert population.size() == 3
+    assert population.max_fitness() == pytest.approx(1.8)
+
+
+class SumFitnessFunction(Fitness):
+    def fitness(self, individual):
+        return individual.genotype.dna[0] + individual.genotype.dna[1]
+
+    def value(self, individual, x):
+        pass
+
+
+def test_elitist_replacement():
+    population = build_fully_specified_population()
+    offspring = [build_individual([0.1, 0.7], []), build_individual([0.0, 0.0], []), build_individual([0.5, 0.6], [])]
+
+    ElitistReplacement(3).replace(offspring, population, SumFitnessFunction())
+
+    assert population.size() == 3
+    assert sorted(population.fitness_values().tolist()) == pytest.approx([0.8, 1.0, 1.1])
+    assert population.get(offspring[0].id) is not None
+    assert population.get(offspring[2].id) is not None
+
+
+def test_comma_replacement():
+    population = build_fully_specified_population()
+    dna = np.array([[0.0, 0.1], [0.0, 0.2], [0.0, 0.3], [0.0, 0.4]])
+
+    replacement = CommaReplacement(4)
+    assert replacement.offspring_demand(population, 10) == 4
+    assert replacement.offspring_demand(population, 2) == 4
+    replacement.replace_batch(dna, np.empty((4, 0)), population, SumFitnessFunction())
+
+    assert population.size() == 3
+    assert sorted(population.fitness_values().tolist()) == pytest.approx([0.2, 0.3, 0.4])
+
+
+def test_age_based_replacement():
+    population = build_fully_specified_population()
+    population.update(SumFitnessFunction())
+    population.add(build_individual([0.0, 0.0], []), 0.0)
+    dna = np.array([[0.3, 0.3], [0.4, 0.4]])
+
+    AgeBasedReplacement(2).replace_batch(dna, np.empty((2, 0)), population, SumFitnessFunction())
+
+    # the two worst among the oldest die, the youngest survives.
+    assert population.size() == 4
+    assert sorted(population.fitness_values().tolist()) == pytest.approx([0.0, 0.6, 0.8, 1.0])
+    assert population.get('3adee626-de78-4f83-84f9-ebde4e8ee64d') is not None
+
+
+def test_round_robin_tournament_replacement():
+    population = build_fully_specified_population()
+    dna = np.array([[0.5, 0.5], [-1.0, -1.0]])
+
+    replacement = RoundRobinTournamentReplacement(2, opponents=50)
+    replacement.replace_batch(dna, np.empty((2, 0)), population, SumFitnessFunction(), rng=np.random.default_rng(1))
+
+    assert population.size() == 3
+    assert sorted(population.fitness_values().tolist()) == pytest.approx([0.6, 1.0, 1.0])
+
+
+def test_replace_evaluated():
+    population = build_fully_specified_population()
+    ElitistReplacement(2).replace_evaluated(np.array([[0.9, 0.9], [0.0, 0.0]]), np.empty((2, 0)), np.array([1.8, 0.0]), population)
+
+    assert population.size() == 3
+    assert sorted(population.fitness_values().tolist()) == pytest.approx([0.6, 1.0, 1.8])
+
+    # replacements only implementing `replace` have evaluated children replace the worst individuals.
+    class ReplaceAll(Replacement):
+        def replace(self, offspring, population, fitness_function, evaluator=None, rng=None):
+            pass
+
+    ReplaceAll(1).replace_evaluated(np.array([[0.5, 0.5], [0.2, 0.2]]), np.empty((2, 0)), np.array([1.0, 0.4]), population)
+    assert population.size() == 3
+    assert sorted(population.fitness_values().tolist()) == pytest.approx([0.4, 1.0, 1.8])
@@ -1,4 +1,5 @@
-from auxein.parents.selections import cumulative_probability_distribution as cpd, StochasticUniversalSampling
+from auxein.parents.selections import cumulative_probability_distribution as cpd, StochasticUniversalSampling, TournamentSelection, TruncationSelection
+from auxein.parents.selections import AliasTable, RouletteWheelSelection, sample_couples
 
 import numpy as np
 
@@ -13,15 +14,72 @@ def test_cumulative_probability_distribution_with_known_values():
 
 
 def test_stochastic_universal_sampling():
-    individuals_ids = ['a', 'b', 'c', 'd', 'e']
-    probabilities = [0.15, 0.15, 0.25, 0.1, 0.35]
-    ids = StochasticUniversalSampling(4096).select(individuals_ids, probabilities)
+    probabilities = np.array([0.15, 0.15, 0.25, 0.1, 0.35])
+    selection = StochasticUniversalSampling(2000000)
+    indexes = selection.select(probabilities)
+
+    assert selection.parents_to_select == 1001
+    counts = np.bincount(indexes, minlength=5)
+    # stochastic universal sampling has minimum spread: counts differ from
+    # their expected values by less than one.
+    assert np.all(np.abs(counts - probabilities * selection.parents_to_select) < 1)
+
+
+def test_stochastic_universal_sampling_with_rng():
+    probabilities = np.array([0.15, 0.15, 0.25, 0.1, 0.35])
+    selection = StochasticUniversalSampling(4096)
+    first = selection.select(probabilities, np.random.default_rng(42))
+    second = selection.select(probabilities, np.random.default_rng(42))
+    assert np.array_equal(first, second)
+    assert len(first) == 46
+
+
+def test_tournament_selection():
+    fitness = np.array([-5.0, -1.0, -3.0, -4.0])
+    selection = TournamentSelection(4096, tournament_size=4)
+    indexes = selection.select(fitness, np.random.default_rng(1))
+    assert len(indexes) == 46
+    # the worst individual can only win a tournament against itself.
+    assert np.count_nonzero(indexes == 0) <= 1
+    assert np.all(TournamentSelection(4096, tournament_size=1000).select(fitness) == 1)
+
+
+def test_truncation_selection():
+    fitness = np.random.uniform(-10, 0, 100)
+    selection = TruncationSelection(12)
+    indexes = selection.select(fitness)
+    assert selection.parents_to_select == 3
+    assert set(indexes) == set(np.argsort(fitness)[-3:])
+
+
+def test_alias_table():
+    probabilities = np.array([0.15, 0.15, 0.25, 0.1, 0.35, 0.0])
+    table = AliasTable(probabilities)
+    # the probability of every index can be rebuilt exactly from the table.
+    rebuilt = (table.probabilities + np.bincount(table.aliases, weights=1 - table.probabilities, minlength=6)) / 6
+    assert np.allclose(rebuilt, probabilities)
+
+    indexes = table.draw(200000, np.random.default_rng(7))
+    frequencies = np.bincount(indexes, minlength=6) / 200000
+    assert np.allclose(frequencies, probabilities, atol=0.01)
+    assert frequencies[5] == 0
+
+
+def test_roulette_wheel_selection():
+    selection = RouletteWheelSelection(4096)
+    indexes = selection.select(np.array([0.0, 1.0, 0.0]), np.random.default_rng(3))
+    assert len(indexes) == 46
+    assert np.all(indexes == 1)
+
 
-    from collections import Counter
-    counts = Counter(ids)
+def test_sample_couples_are_distinct_unordered_pairs():
+    rng = np.random.default_rng(3)
+    (first, second) = sample_couples(50, 1225, rng)
+    assert np.all(first < second)
+    assert np.all(second < 50)
+    assert len(set(zip(first.tolist(), second.tolist()))) == 1225
 
-    np.testing.assert_almost_equal(counts['a'] / 46, 0.15, 2)
-    np.testing.assert_almost_equal(counts['b'] / 46, 0.15, 2)
-    np.testing.assert_almost_equal(counts['c'] / 46, 0.25, 2)
-    np.testing.assert_almost_equal(counts['d'] / 46, 0.10, 2)
-    np.testing.assert_almost_equal(counts['e'] / 46, 0.35, 2)
+    (first, second) = sample_couples(10 ** 6, 1000, rng)
+    assert np.all(first < second)
+    assert len(set(zip(first.tolist(), second.tolist()))) == 1000
+    assert sample_couples(5, 0, rng)[0].size == 0